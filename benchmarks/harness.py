@@ -0,0 +1,106 @@
+"""Database configuration and seeding shared by the benchmark scripts.
+
+fishsense_api reads its settings when it is first imported, so scripts call
+one of the `use_*` functions before importing it.
+"""
+
+# The settings mirror the ones tests/conftest.py derives; benchmarks run
+# outside pytest and cannot share its conftest.
+# pylint: disable=duplicate-code
+
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence, Type
+
+from sqlalchemy import ColumnElement, func, insert, literal
+from sqlalchemy.engine import make_url
+from sqlmodel import SQLModel, select
+
+TIMESTAMP = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def use_placeholder_database() -> None:
+    """Configure a database that is never connected to.
+
+    For benchmarks that only exercise models and encoding.
+    """
+    os.environ.setdefault("E4EFS_POSTGRES__HOST", "localhost")
+    os.environ.setdefault("E4EFS_POSTGRES__USERNAME", "benchmark")
+    os.environ.setdefault("E4EFS_POSTGRES__PASSWORD", "benchmark")
+
+
+def use_test_database() -> None:
+    """Configure the disposable database in FISHSENSE_TEST_DATABASE_URL.
+
+    Exits without running the benchmark when the variable is not set.
+    """
+    test_database_url = os.environ.get("FISHSENSE_TEST_DATABASE_URL")
+    if not test_database_url:
+        print("FISHSENSE_TEST_DATABASE_URL is not set; skipping.")
+        sys.exit(0)
+
+    url = make_url(test_database_url)
+    os.environ.update(
+        {
+            "E4EFS_POSTGRES__HOST": url.host or "localhost",
+            "E4EFS_POSTGRES__PORT": str(url.port or 5432),
+            "E4EFS_POSTGRES__DATABASE": url.database,
+            "E4EFS_POSTGRES__USERNAME": url.username,
+            "E4EFS_POSTGRES__PASSWORD": url.password or "",
+            "E4EFS_POSTGRES__REPLICAS": "[]",
+        }
+    )
+
+
+async def recreate_tables(database: Any, *groups: Sequence[SQLModel]) -> None:
+    """Drop and recreate every table, then add each group of rows in turn.
+
+    Args:
+        database (Any): The `fishsense_api.database.Database` to reset.
+        *groups (Sequence[SQLModel]): Rows, grouped so each group only
+            references rows added before it.
+    """
+    async with database.engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    async with database.session_maker() as session:
+        for rows in groups:
+            session.add_all(rows)
+            await session.flush()
+        await session.commit()
+
+
+def insert_images(
+    image: Type[SQLModel],
+    count: int,
+    dive_id: Callable[[ColumnElement], Any],
+    is_canonical: Callable[[ColumnElement], Any],
+):
+    """Build an insert of `count` images numbered from 1, generated server-side.
+
+    Every image belongs to camera 1.
+
+    Args:
+        image (Type[SQLModel]): The image table model.
+        count (int): How many images to insert.
+        dive_id (Callable[[ColumnElement], Any]): Each image's dive id, from
+            its number.
+        is_canonical (Callable[[ColumnElement], Any]): Each image's canonical
+            flag, from its number.
+
+    Returns:
+        The INSERT ... SELECT statement.
+    """
+    number = func.generate_series(1, count).column_valued()
+    columns = {
+        "id": number,
+        "path": func.concat("image-", number),
+        "checksum": func.concat("checksum-", number),
+        "taken_datetime": literal(TIMESTAMP),
+        "is_canonical": is_canonical(number),
+        "dive_id": dive_id(number),
+        "camera_id": literal(1),
+    }
+    return insert(image.__table__).from_select(list(columns), select(*columns.values()))
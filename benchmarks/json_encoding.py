@@ -0,0 +1,95 @@
+"""Benchmark the JSON response paths for a large label list.
+
+Compares how a list endpoint's rows become response bytes: FastAPI's default
+path (revalidate against the response model, serialize, `json.dumps`), the
+`jsonable_encoder` path used without a response model, and the single-pass
+`FastJSONResponse` encoding, for both model instances and projected dict rows.
+
+Run from the repository root; no database is needed:
+
+    python benchmarks/json_encoding.py
+"""
+
+# pylint: disable=wrong-import-position
+
+import asyncio
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, List
+
+from harness import use_placeholder_database
+
+use_placeholder_database()
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from fishsense_api.models.head_tail_label import HeadTailLabel
+from fishsense_api.responses import FastJSONResponse
+
+ROWS = 20_000
+REPEAT = 5
+
+
+def _labels() -> List[HeadTailLabel]:
+    updated_at = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    return [
+        HeadTailLabel(
+            id=i,
+            label_studio_task_id=i,
+            label_studio_project_id=1,
+            head_x=1.5,
+            head_y=2.5,
+            tail_x=3.5,
+            tail_y=4.5,
+            updated_at=updated_at,
+            superseded=False,
+            completed=True,
+            image_id=i,
+            user_id=1,
+        )
+        for i in range(ROWS)
+    ]
+
+
+def _best_ms(render: Callable[[], bytes]) -> float:
+    return min(timeit.repeat(render, number=1, repeat=REPEAT)) * 1e3
+
+
+def main() -> None:
+    """Time each encoding path and print the cost per request and per row."""
+    labels = _labels()
+    rows = [label.model_dump() for label in labels]
+    # The response field FastAPI builds for `-> List[HeadTailLabel]`.
+    field = create_model_field(
+        name="Response_benchmark", type_=List[HeadTailLabel], mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+
+    def serialize(content: Any, response_field=None) -> bytes:
+        serialized = loop.run_until_complete(
+            serialize_response(field=response_field, response_content=content)
+        )
+        return JSONResponse(serialized).body
+
+    cases = [
+        ("response model + json.dumps", lambda: serialize(labels, field)),
+        ("jsonable_encoder + json.dumps", lambda: serialize(labels)),
+        ("FastJSONResponse, models", lambda: FastJSONResponse(labels).body),
+        ("FastJSONResponse, dict rows", lambda: FastJSONResponse(rows).body),
+    ]
+    baseline = None
+    print(f"{'path':<32}{'request':>11}{'per row':>10}{'speedup':>10}")
+    for label, render in cases:
+        elapsed = _best_ms(render)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<32}{elapsed:>9.1f}ms{elapsed / ROWS * 1e3:>8.2f}us"
+            f"{baseline / elapsed:>9.2f}x"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
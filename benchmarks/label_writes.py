@@ -0,0 +1,136 @@
+"""Benchmark the request-body handling of the single-label PUT endpoints.
+
+Label sync sends one PUT per Label Studio task. Compares the CPU each handler
+spends turning the parsed body into upsert values: the previous round trip
+through `jsonable_encoder` and `model_validate`, and the current
+`body.model_dump()` merged with the path id. Bodies carry a Label Studio
+annotation export like the ones label sync sends.
+
+Run from the repository root; no database is needed:
+
+    python benchmarks/label_writes.py
+"""
+
+# pylint: disable=wrong-import-position
+
+import timeit
+from typing import Any, Callable, Dict, List, Type
+
+from harness import use_placeholder_database
+
+use_placeholder_database()
+
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import SQLModel
+
+from fishsense_api.models.head_tail_label import HeadTailLabel
+from fishsense_api.models.laser_label import LaserLabel
+
+BODIES = 5_000
+REPEAT = 5
+
+
+def _label_studio_json(task_id: int) -> Dict[str, Any]:
+    return {
+        "id": task_id,
+        "data": {"img": f"https://labels.example.com/images/{task_id}.jpg"},
+        "annotations": [
+            {
+                "id": task_id * 10 + annotation,
+                "completed_by": 1,
+                "created_at": "2024-01-01T12:00:00.000000Z",
+                "updated_at": "2024-01-01T12:05:00.000000Z",
+                "lead_time": 12.5,
+                "result": [
+                    {
+                        "id": f"point-{annotation}-{point}",
+                        "type": "keypointlabels",
+                        "from_name": "keypoints",
+                        "to_name": "img",
+                        "original_width": 4000,
+                        "original_height": 3000,
+                        "value": {
+                            "x": 10.0 + point,
+                            "y": 20.0 + point,
+                            "width": 0.25,
+                            "keypointlabels": ["Head" if point else "Tail"],
+                        },
+                    }
+                    for point in range(2)
+                ],
+            }
+            for annotation in range(2)
+        ],
+    }
+
+
+def _bodies(model: Type[SQLModel], values: Dict[str, Any]) -> List[SQLModel]:
+    # Parsed from JSON-like dicts, as FastAPI hands them to the handler.
+    return [
+        model.model_validate(
+            {
+                "label_studio_task_id": task_id,
+                "label_studio_project_id": 1,
+                "updated_at": "2024-01-01T12:05:00Z",
+                "completed": True,
+                "label_studio_json": _label_studio_json(task_id),
+                "user_id": 1,
+                **values,
+            }
+        )
+        for task_id in range(BODIES)
+    ]
+
+
+def round_trip(model: Type[SQLModel], body: SQLModel, image_id: int) -> dict:
+    """Upsert values as the handlers built them before."""
+    label = model.model_validate(jsonable_encoder(body))
+    label.image_id = image_id
+    return label.model_dump()
+
+
+def model_dump(_model: Type[SQLModel], body: SQLModel, image_id: int) -> dict:
+    """Upsert values as the handlers build them now."""
+    return body.model_dump() | {"image_id": image_id}
+
+
+def _per_body_us(
+    model: Type[SQLModel],
+    bodies: List[SQLModel],
+    build: Callable[[Type[SQLModel], SQLModel, int], dict],
+) -> float:
+    best = min(
+        timeit.repeat(
+            lambda: [build(model, body, 1) for body in bodies], number=1, repeat=REPEAT
+        )
+    )
+    return best / len(bodies) * 1e6
+
+
+def main() -> None:
+    """Time both ways of building upsert values and print the cost per body."""
+    cases = [
+        (
+            "put_headtail_label",
+            HeadTailLabel,
+            {"head_x": 1.5, "head_y": 2.5, "tail_x": 3.5, "tail_y": 4.5},
+        ),
+        ("put_laser_label", LaserLabel, {"x": 1.5, "y": 2.5, "label": "laser"}),
+    ]
+    print(
+        f"{'handler':<22}{'before':>10}{'after':>10}{'speedup':>10}"
+        f"{'bodies/s after':>16}"
+    )
+    for name, model, values in cases:
+        bodies = _bodies(model, values)
+        assert round_trip(model, bodies[0], 1) == model_dump(model, bodies[0], 1)
+        before = _per_body_us(model, bodies, round_trip)
+        after = _per_body_us(model, bodies, model_dump)
+        print(
+            f"{name:<22}{before:>8.2f}us{after:>8.2f}us{before / after:>9.2f}x"
+            f"{1e6 / after:>16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
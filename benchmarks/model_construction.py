@@ -0,0 +1,199 @@
+"""Benchmark ModelBase construction cost per row.
+
+Compares the current ModelBase, which computes its datetime fields once per
+class, with the previous implementation, which re-walked the annotations and
+model fields on every construction. Both are measured on the same label-like
+row, as a table model built from keyword arguments (reads and upserts) and as
+a plain model validated from a dict (request bodies).
+
+Run from the repository root; no database is needed:
+
+    python benchmarks/model_construction.py
+"""
+
+# LegacyModelBase copies the previous ModelBase verbatim, so it repeats code the
+# current one kept.
+# pylint: disable=wrong-import-position,duplicate-code
+
+import timeit
+import types
+from abc import ABC
+from datetime import datetime
+from typing import Any, Callable, Dict, get_args
+
+from harness import use_placeholder_database
+
+use_placeholder_database()
+
+from pydantic import model_validator
+from sqlmodel import Field, SQLModel
+
+from fishsense_api.models.model_base import ModelBase
+
+ROWS = 20_000
+REPEAT = 5
+
+
+class LegacyModelBase(ABC, SQLModel):
+    """ModelBase as it was before datetime fields were precomputed per class."""
+
+    def __init__(self, **data):
+        # Coerce ISO datetime strings for annotated datetime fields before pydantic parsing
+        def _is_datetime_annotation(ann) -> bool:
+            if ann is None:
+                return False
+            if ann is datetime:
+                return True
+            args = get_args(ann)
+            if args:
+                return any(_is_datetime_annotation(a) for a in args)
+            return False
+
+        ann = getattr(self.__class__, "__annotations__", {})
+        for key, val in list(data.items()):
+            field_info = ann.get(key)
+            if field_info is None and hasattr(self.__class__, "model_fields"):
+                mf = self.__class__.model_fields.get(key)
+                if mf is not None:
+                    field_info = getattr(mf, "annotation", None)
+            if _is_datetime_annotation(field_info) or (
+                isinstance(key, str)
+                and ("date" in key.lower() or key.lower().endswith("_at"))
+            ):
+                if isinstance(val, str) and val:
+                    try:
+                        data[key] = datetime.fromisoformat(val.replace("Z", "+00:00"))
+                    except (ValueError, TypeError):
+                        pass
+                elif val == "":
+                    data[key] = None
+
+        super().__init__(**data)
+
+    @model_validator(mode="before")
+    @classmethod
+    def parse_date_fields(cls, values: dict):
+        """Model-level validator to coerce ISO datetime strings to datetimes.
+
+        Runs before field parsing so it can accept raw input values (dicts, strs).
+        """
+        if not isinstance(values, dict):
+            return values
+
+        def _is_datetime_annotation(ann) -> bool:
+            if ann is None:
+                return False
+            if ann is datetime:
+                return True
+            args = get_args(ann)
+            if args:
+                return any(_is_datetime_annotation(a) for a in args)
+            return False
+
+        for key, val in list(values.items()):
+            # Determine declared annotation for this field
+            field_info = getattr(cls, "__annotations__", {}).get(key)
+            # Fallback to model_fields metadata when available
+            if field_info is None and hasattr(cls, "model_fields"):
+                mf = cls.model_fields.get(key)
+                if mf is not None:
+                    field_info = getattr(mf, "annotation", None)
+
+            if _is_datetime_annotation(field_info) or (
+                isinstance(key, str)
+                and ("date" in key.lower() or key.lower().endswith("_at"))
+            ):
+                if isinstance(val, str) and val:
+                    try:
+                        values[key] = datetime.fromisoformat(val.replace("Z", "+00:00"))
+                    except (ValueError, TypeError):
+                        # leave as-is; pydantic will raise if invalid
+                        pass
+                elif val == "":
+                    values[key] = None
+
+        return values
+
+
+def _row_model(base: type, name: str, table: bool) -> type:
+    # Same fields as a head-tail label, declared on the class itself.
+    namespace: Dict[str, Any] = {
+        "__annotations__": {
+            "id": int | None,
+            "label_studio_task_id": int | None,
+            "label_studio_project_id": int | None,
+            "head_x": float | None,
+            "head_y": float | None,
+            "tail_x": float | None,
+            "tail_y": float | None,
+            "updated_at": datetime | None,
+            "superseded": bool | None,
+            "completed": bool | None,
+            "image_id": int | None,
+            "user_id": int | None,
+        },
+        "id": Field(default=None, primary_key=True),
+        "superseded": False,
+        "completed": False,
+    }
+    for key in namespace["__annotations__"]:
+        namespace.setdefault(key, None)
+    if table:
+        namespace["__tablename__"] = f"benchmark_{name.lower()}"
+    return types.new_class(
+        name,
+        (base,),
+        {"table": True} if table else {},
+        lambda ns: ns.update(namespace),
+    )
+
+
+def _row(i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "label_studio_task_id": i,
+        "label_studio_project_id": 1,
+        "head_x": 1.0,
+        "head_y": 2.0,
+        "tail_x": 3.0,
+        "tail_y": 4.0,
+        "updated_at": "2024-01-01T12:00:00Z",
+        "superseded": False,
+        "completed": True,
+        "image_id": i,
+        "user_id": 1,
+    }
+
+
+def _per_row_us(model: type, build: Callable[[type, Dict[str, Any]], Any]) -> float:
+    rows = [_row(i) for i in range(ROWS)]
+    best = min(
+        timeit.repeat(
+            lambda: [build(model, dict(row)) for row in rows], number=1, repeat=REPEAT
+        )
+    )
+    return best / ROWS * 1e6
+
+
+def main() -> None:
+    """Time both implementations and print the cost per row."""
+    cases = [
+        ("table model, keyword arguments", "Table", lambda model, row: model(**row)),
+        (
+            "plain model, model_validate",
+            "",
+            lambda model, row: model.model_validate(row),
+        ),
+    ]
+    print(f"{'case':<34}{'before':>10}{'after':>10}{'speedup':>10}")
+    for label, kind, build in cases:
+        legacy = _row_model(LegacyModelBase, f"Legacy{kind}Row", bool(kind))
+        current = _row_model(ModelBase, f"Current{kind}Row", bool(kind))
+        assert isinstance(build(current, _row(1)).updated_at, datetime)
+        before = _per_row_us(legacy, build)
+        after = _per_row_us(current, build)
+        print(f"{label:<34}{before:>8.2f}us{after:>8.2f}us{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
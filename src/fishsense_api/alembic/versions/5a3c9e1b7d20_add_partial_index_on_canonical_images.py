@@ -0,0 +1,47 @@
+"""add partial index on canonical images
+
+Revision ID: 5a3c9e1b7d20
+Revises: e1fc97743091
+Create Date: 2026-10-18 10:12:41.518204
+
+"""
+
+# pylint: skip-file
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a3c9e1b7d20"
+down_revision: Union[str, Sequence[str], None] = "e1fc97743091"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # image holds millions of rows; build without blocking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_image_dive_id_canonical",
+            "image",
+            ["dive_id"],
+            unique=False,
+            postgresql_where=sa.text("is_canonical"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_image_dive_id_canonical",
+            table_name="image",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
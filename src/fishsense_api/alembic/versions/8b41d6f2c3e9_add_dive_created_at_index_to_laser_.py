@@ -0,0 +1,45 @@
+"""add dive created_at index to laser extrinsics
+
+Revision ID: 8b41d6f2c3e9
+Revises: 5a3c9e1b7d20
+Create Date: 2026-10-18 11:03:17.094362
+
+"""
+
+# pylint: skip-file
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b41d6f2c3e9"
+down_revision: Union[str, Sequence[str], None] = "5a3c9e1b7d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_laserextrinsics_dive_id_created_at",
+            "laserextrinsics",
+            ["dive_id", sa.text("created_at DESC NULLS LAST")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_laserextrinsics_dive_id_created_at",
+            table_name="laserextrinsics",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,56 @@
+"""add foreign key indexes
+
+Revision ID: c2e7a9f04b15
+Revises: 8b41d6f2c3e9
+Create Date: 2026-10-18 11:40:52.731906
+
+"""
+
+# pylint: skip-file
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2e7a9f04b15"
+down_revision: Union[str, Sequence[str], None] = "8b41d6f2c3e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so these
+# run in autocommit mode and do not lock the tables against writes.
+INDEXES = [
+    ("ix_image_dive_id", "image", "dive_id"),
+    ("ix_diveframecluster_dive_id", "diveframecluster", "dive_id"),
+    ("ix_measurement_fish_id", "measurement", "fish_id"),
+    ("ix_cameraintrinsics_camera_id", "cameraintrinsics", "camera_id"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
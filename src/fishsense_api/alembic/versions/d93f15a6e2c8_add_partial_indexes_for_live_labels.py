@@ -0,0 +1,53 @@
+"""add partial indexes for live labels
+
+Revision ID: d93f15a6e2c8
+Revises: c2e7a9f04b15
+Create Date: 2026-10-18 12:21:09.406157
+
+"""
+
+# pylint: skip-file
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d93f15a6e2c8"
+down_revision: Union[str, Sequence[str], None] = "c2e7a9f04b15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_headtaillabel_image_id_not_superseded", "headtaillabel"),
+    ("ix_laserlabel_image_id_not_superseded", "laserlabel"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["image_id"],
+                unique=False,
+                postgresql_where=sa.text("NOT superseded"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
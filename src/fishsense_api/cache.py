@@ -0,0 +1,276 @@
+"""In-process read-through cache for small, rarely changing reference tables.
+
+Workers keep their caches coherent over Postgres LISTEN/NOTIFY: every write
+to a cached table sends a NOTIFY on the table's channel when it commits, and
+each worker's `listen_for_invalidations` task clears its copy.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+
+import asyncpg
+from sqlalchemy import URL, event, func, select
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.config import settings
+from fishsense_api.metrics import CallbackCounter, Gauge
+
+logger = logging.getLogger(__name__)
+
+_INVALIDATE_ON_COMMIT = "invalidate_on_commit"
+CHANNEL_PREFIX = "cache_"
+PING_INTERVAL = 30
+RECONNECT_DELAY = 5
+
+
+class TTLCache:
+    """A bounded least-recently-used cache whose entries expire after a TTL.
+
+    Misses are not cached, so a row created after a failed lookup is picked
+    up by the next request.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Look up a live entry and mark it as recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any: The cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to cache.
+        """
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for `key`, loading and caching it on a miss.
+
+        Args:
+            key (Hashable): The cache key.
+            load (Callable[[], Awaitable[Any]]): Loads the value from the database.
+
+        Returns:
+            Any: The cached or loaded value, or None if `load` found nothing.
+        """
+        value = self.get(key)
+        if value is None:
+            value = await load()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Report the cache's size and hit/miss counters.
+
+        Returns:
+            Dict[str, int]: The current size, maximum size, hits and misses.
+        """
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+CACHES: Dict[str, TTLCache] = {}
+
+
+def _cache_stat(stat: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    return lambda: {(name,): cache.stats()[stat] for name, cache in CACHES.items()}
+
+
+Gauge(
+    "fishsense_cache_size",
+    "Entries held in each table cache.",
+    _cache_stat("size"),
+    ("table",),
+)
+Gauge(
+    "fishsense_cache_maxsize",
+    "Entries each table cache can hold.",
+    _cache_stat("maxsize"),
+    ("table",),
+)
+CallbackCounter(
+    "fishsense_cache_hits_total",
+    "Lookups answered from each table cache.",
+    _cache_stat("hits"),
+    ("table",),
+)
+CallbackCounter(
+    "fishsense_cache_misses_total",
+    "Lookups each table cache had to load from the database.",
+    _cache_stat("misses"),
+    ("table",),
+)
+
+
+def table_cache(model: Type[SQLModel]) -> TTLCache:
+    """Get the shared cache for a table model, creating it on first use.
+
+    Args:
+        model (Type[SQLModel]): The table model.
+
+    Returns:
+        TTLCache: The table's cache.
+    """
+    name = model.__tablename__
+    if name not in CACHES:
+        CACHES[name] = TTLCache(maxsize=settings.cache.maxsize, ttl=settings.cache.ttl)
+    return CACHES[name]
+
+
+def cache_key(*parts: Any) -> Tuple:
+    """Build a hashable cache key, turning lists such as fieldsets into tuples.
+
+    Returns:
+        Tuple: The cache key.
+    """
+    return tuple(tuple(part) if isinstance(part, list) else part for part in parts)
+
+
+def channel(name: str) -> str:
+    """Get the NOTIFY channel for a cached table.
+
+    Args:
+        name (str): The table name.
+
+    Returns:
+        str: The channel name.
+    """
+    return f"{CHANNEL_PREFIX}{name}"
+
+
+async def invalidate_on_commit(session: AsyncSession, model: Type[SQLModel]) -> None:
+    """Clear a table's cache on every worker once the session's transaction commits.
+
+    The local cache is cleared by an `after_commit` hook; other workers are
+    told through a NOTIFY, which Postgres only delivers if the transaction
+    commits. Clearing after the commit keeps concurrent readers from caching
+    the row as it was before the write.
+
+    Args:
+        session (AsyncSession): The session performing the write.
+        model (Type[SQLModel]): The table model being written to.
+    """
+    name = model.__tablename__
+    session.sync_session.info.setdefault(_INVALIDATE_ON_COMMIT, set()).add(name)
+    await session.exec(select(func.pg_notify(channel(name), "")))
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_written_tables(session: Session) -> None:
+    for name in session.info.pop(_INVALIDATE_ON_COMMIT, ()):
+        if name in CACHES:
+            logger.debug("Clearing %s cache after commit", name)
+            CACHES[name].clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_tables(session: Session) -> None:
+    session.info.pop(_INVALIDATE_ON_COMMIT, None)
+
+
+def _on_notification(
+    _connection: asyncpg.Connection, _pid: int, notified: str, _payload: str
+) -> None:
+    name = notified.removeprefix(CHANNEL_PREFIX)
+    if name in CACHES:
+        logger.debug("Clearing %s cache on notification", name)
+        CACHES[name].clear()
+
+
+async def _listen(url: URL) -> None:
+    connection = await asyncpg.connect(**url.translate_connect_args(username="user"))
+    try:
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        for name in CACHES:
+            await connection.add_listener(channel(name), _on_notification)
+
+        # Writes made while this worker was not listening went unnoticed.
+        for cache in CACHES.values():
+            cache.clear()
+        logger.info("Listening for cache invalidations on %d tables", len(CACHES))
+
+        while not closed.is_set():
+            try:
+                await asyncio.wait_for(closed.wait(), timeout=PING_INTERVAL)
+            except asyncio.TimeoutError:
+                await connection.execute("SELECT 1")
+    finally:
+        await connection.close()
+
+
+async def listen_for_invalidations(url: URL) -> None:
+    """Clear caches when other workers write to cached tables, until cancelled.
+
+    Holds a dedicated connection outside the pool, pings it periodically and
+    reconnects after failures.
+
+    Args:
+        url (URL): The database URL.
+    """
+    while True:
+        try:
+            await _listen(url)
+            logger.warning("Cache invalidation connection closed; reconnecting")
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Any failure, e.g. InterfaceError from a ping on a closed
+            # connection, must not end the task: this worker's caches would
+            # never be invalidated again.
+            logger.warning(
+                "Cache invalidation listener failed; retrying in %ds: %s",
+                RECONNECT_DELAY,
+                exc,
+            )
+        await asyncio.sleep(RECONNECT_DELAY)
@@ -26,6 +26,18 @@ validators = [
     Validator("postgres.port", required=True, cast=int, default=5432),
     Validator("postgres.username", required=True, cast=str),
     Validator("postgres.password", required=True, cast=str),
+    Validator("postgres.pool_size", cast=int, default=5),
+    Validator("postgres.max_overflow", cast=int, default=2),
+    Validator("postgres.pool_timeout", cast=float, default=30),
+    Validator("postgres.pool_recycle", cast=int, default=3600),
+    Validator("postgres.pool_pre_ping", cast=bool, default=True),
+    Validator("postgres.replicas", cast=list, default=[]),
+    Validator("postgres.read_your_writes_seconds", cast=int, default=10),
+    Validator("cache.maxsize", cast=int, default=1024),
+    Validator("cache.ttl", cast=float, default=300),
+    Validator("api.fast_json", cast=bool, default=False),
+    Validator("profiling.server_timing", cast=bool, default=False),
+    Validator("profiling.slow_query_ms", cast=float, default=0),
 ]
 
 settings = Dynaconf(
@@ -39,10 +51,45 @@ settings = Dynaconf(
     validators=validators,
 )
 
-PG_CONNECTION_STRING = (
-    f"postgresql+asyncpg://{settings.postgres.username}:{settings.postgres.password}"
-    + f"@{settings.postgres.host}:{settings.postgres.port}/{settings.postgres.database}"
+
+def get_connection_string(host: str, port: int) -> str:
+    """Get the connection string for a Postgres server.
+
+    Args:
+        host (str): The server's hostname.
+        port (int): The server's port.
+
+    Returns:
+        str: The connection string, using the configured credentials and database.
+    """
+    return (
+        f"postgresql+asyncpg://{settings.postgres.username}:{settings.postgres.password}"
+        + f"@{host}:{port}/{settings.postgres.database}"
+    )
+
+
+PG_CONNECTION_STRING = get_connection_string(
+    settings.postgres.host, settings.postgres.port
 )
 
+
+def get_replica_connection_string(replica: str) -> str:
+    """Get the connection string for a read replica.
+
+    Args:
+        replica (str): The replica as "host" or "host:port". The port defaults
+            to the primary's.
+
+    Returns:
+        str: The connection string.
+    """
+    host, _, port = replica.partition(":")
+    return get_connection_string(host, int(port) if port else settings.postgres.port)
+
+
+PG_REPLICA_CONNECTION_STRINGS = [
+    get_replica_connection_string(replica) for replica in settings.postgres.replicas
+]
+
 # `envvar_prefix` = export envvars with `export DYNACONF_FOO=bar`.
 # `settings_files` = Load these files in the order.
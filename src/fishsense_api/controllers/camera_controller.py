@@ -4,71 +4,91 @@ import logging
 from typing import List
 
 from fastapi import Depends, HTTPException
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fishsense_api.database import get_async_session
+from fishsense_api.cache import cache_key, invalidate_on_commit, table_cache
+from fishsense_api.database import (
+    get_cache_session,
+    get_read_session,
+    get_write_session,
+)
 from fishsense_api.models.camera import Camera
 from fishsense_api.models.camera_intrinsics import CameraIntrinsics
+from fishsense_api.pagination import Page, PageParams, page_params, paginate
+from fishsense_api.projection import FieldSelector, fetch_first, respond, select_fields
 from fishsense_api.server import app
+from fishsense_api.upsert import upsert
 
 logger = logging.getLogger(__name__)
 
+CAMERA_CACHE = table_cache(Camera)
+INTRINSICS_CACHE = table_cache(CameraIntrinsics)
+
 
 @app.get("/api/v1/cameras/")
 async def get_cameras(
-    session: AsyncSession = Depends(get_async_session),
-) -> List[Camera]:
-    """Retrieve all cameras."""
+    page: PageParams = Depends(page_params),
+    fields: List[str] | None = Depends(FieldSelector(Camera)),
+    session: AsyncSession = Depends(get_read_session),
+) -> Page[Camera] | List[Camera]:
+    """Retrieve all cameras, one page at a time."""
     logger.debug("Retrieving all cameras")
-    query = select(Camera)
+    query = select_fields(Camera, fields)
 
-    return (await session.exec(query)).all()
+    return respond(await paginate(session, query, Camera.id, page, fields), fields)
 
 
 @app.get("/api/v1/cameras/{camera_id}")
 async def get_camera(
-    camera_id: int, session: AsyncSession = Depends(get_async_session)
+    camera_id: int,
+    fields: List[str] | None = Depends(FieldSelector(Camera)),
+    session: AsyncSession = Depends(get_cache_session),
 ) -> Camera | None:
     """Retrieve a camera by its ID."""
     logger.debug("Retrieving camera with id=%d", camera_id)
-    query = select(Camera).where(Camera.id == camera_id)
+    query = select_fields(Camera, fields).where(Camera.id == camera_id)
 
-    camera = (await session.exec(query)).first()
+    camera = await CAMERA_CACHE.get_or_load(
+        cache_key(camera_id, fields), lambda: fetch_first(session, query, fields)
+    )
     if camera is None:
         logger.warning("Camera with id=%d not found", camera_id)
         raise HTTPException(status_code=404, detail="Camera not found")
-    return camera
+    return respond(camera, fields)
 
 
 @app.get("/api/v1/cameras/{camera_id}/intrinsics/")
 async def get_camera_intrinsics(
-    camera_id: int, session: AsyncSession = Depends(get_async_session)
+    camera_id: int,
+    fields: List[str] | None = Depends(FieldSelector(CameraIntrinsics)),
+    session: AsyncSession = Depends(get_cache_session),
 ) -> CameraIntrinsics | None:
     """Retrieve camera intrinsics for a given camera ID."""
     logger.debug("Retrieving intrinsics for camera with id=%d", camera_id)
-    query = select(CameraIntrinsics).where(CameraIntrinsics.camera_id == camera_id)
+    query = select_fields(CameraIntrinsics, fields).where(
+        CameraIntrinsics.camera_id == camera_id
+    )
 
-    camera_intrinsics = (await session.exec(query)).first()
+    camera_intrinsics = await INTRINSICS_CACHE.get_or_load(
+        cache_key(camera_id, fields), lambda: fetch_first(session, query, fields)
+    )
     if camera_intrinsics is None:
         logger.warning("Camera intrinsics for camera with id=%d not found", camera_id)
         raise HTTPException(status_code=404, detail="Camera intrinsics not found")
-    return camera_intrinsics
+    return respond(camera_intrinsics, fields)
 
 
 @app.put("/api/v1/cameras/{camera_id}/intrinsics/", status_code=201)
 async def put_camera_intrinsics(
     camera_id: int,
     intrinsics: CameraIntrinsics,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update camera intrinsics for a given camera ID."""
     logger.debug("Creating or updating intrinsics for camera with id=%d", camera_id)
     intrinsics.camera_id = camera_id
 
-    intrinsics = await session.merge(intrinsics)
-    await session.flush()
-
-    intrinsics_id = intrinsics.id
+    intrinsics_id = await upsert(session, CameraIntrinsics, intrinsics.model_dump())
+    await invalidate_on_commit(session, CameraIntrinsics)
 
     return intrinsics_id
@@ -5,101 +5,143 @@ import logging
 from typing import List
 
 from fastapi import Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Integer, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fishsense_api.database import get_async_session
+from fishsense_api.database import get_read_session, get_write_session
 from fishsense_api.models.dive import Dive
 from fishsense_api.models.image import Image
-from fishsense_api.models.laser_extrinsics import LaserExtrinsics
+from fishsense_api.models.laser_extrinsics import (
+    LaserExtrinsics,
+    LaserExtrinsicsLookup,
+)
+from fishsense_api.pagination import Page, PageParams, page_params, paginate
+from fishsense_api.projection import (
+    FieldSelector,
+    fetch_all,
+    fetch_first,
+    respond,
+    select_fields,
+)
 from fishsense_api.server import app
+from fishsense_api.upsert import upsert
 
 logger = logging.getLogger(__name__)
 
+# Matches the ix_laserextrinsics_dive_id_created_at index ordering.
+LATEST_FIRST = LaserExtrinsics.created_at.desc().nulls_last()
+
 
 @app.get("/api/v1/dives/")
-async def get_dives(session: AsyncSession = Depends(get_async_session)) -> List[Dive]:
-    """Retrieve all dives."""
+async def get_dives(
+    page: PageParams = Depends(page_params),
+    fields: List[str] | None = Depends(FieldSelector(Dive)),
+    session: AsyncSession = Depends(get_read_session),
+) -> Page[Dive] | List[Dive]:
+    """Retrieve all dives, one page at a time."""
     logger.debug("Retrieving all dives")
-    query = select(Dive)
+    query = select_fields(Dive, fields)
 
-    return (await session.exec(query)).all()
+    return respond(await paginate(session, query, Dive.id, page, fields), fields)
 
 
 @app.get("/api/v1/canonical/dives/")
 async def get_canonical_dives(
-    session: AsyncSession = Depends(get_async_session),
+    fields: List[str] | None = Depends(FieldSelector(Dive)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[Dive]:
     """Retrieve all canonical dives."""
     logger.debug("Retrieving all canonical dives")
-    query = (
-        select(Dive)
-        .distinct(Dive.id)
-        .join_from(Dive, Image, Dive.id == Image.dive_id)
-        .where(Image.is_canonical == True)
+    has_canonical_image = (
+        select(Image.id)
+        .where(Image.dive_id == Dive.id)
+        .where(Image.is_canonical)
+        .exists()
     )
+    query = select_fields(Dive, fields).where(has_canonical_image).order_by(Dive.id)
 
-    result = await session.exec(query)
-    return result.all()
+    return respond(await fetch_all(session, query, fields), fields)
 
 
 @app.get("/api/v1/dives/{dive_id}")
 async def get_dive(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    fields: List[str] | None = Depends(FieldSelector(Dive)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Dive | None:
     """Retrieve a dive by its ID."""
     logger.debug("Retrieving dive with id=%d", dive_id)
-    query = select(Dive).where(Dive.id == dive_id)
+    query = select_fields(Dive, fields).where(Dive.id == dive_id)
 
-    dive = (await session.exec(query)).first()
+    dive = await fetch_first(session, query, fields)
     if dive is None:
         logger.warning("Dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Dive not found")
-    return dive
+    return respond(dive, fields)
 
 
 @app.get("/api/v1/dives/{dive_id}/laser-extrinsics/")
 async def get_laser_extrinsics_for_dive(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    fields: List[str] | None = Depends(FieldSelector(LaserExtrinsics)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> LaserExtrinsics | None:
     """Retrieve all laser extrinsics for a given dive ID."""
     logger.debug("Retrieving laser extrinsics for dive with id=%d", dive_id)
-    # With max date filter
     query = (
-        select(LaserExtrinsics)
+        select_fields(LaserExtrinsics, fields)
         .where(LaserExtrinsics.dive_id == dive_id)
-        .where(
-            LaserExtrinsics.created_at
-            == select(LaserExtrinsics.created_at)
-            .where(LaserExtrinsics.dive_id == dive_id)
-            .order_by(LaserExtrinsics.created_at.desc())  # pylint: disable=no-member
-            .limit(1)
-            .scalar_subquery()
-        )
+        .order_by(LATEST_FIRST)
+        .limit(1)
     )
 
-    laser_extrinsics = (await session.exec(query)).first()
+    laser_extrinsics = await fetch_first(session, query, fields)
     if laser_extrinsics is None:
         logger.warning("Laser extrinsics for dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Laser extrinsics not found")
-    return laser_extrinsics
+    return respond(laser_extrinsics, fields)
+
+
+@app.post("/api/v1/dives/laser-extrinsics:latest")
+async def get_latest_laser_extrinsics(
+    lookup: LaserExtrinsicsLookup,
+    fields: List[str] | None = Depends(FieldSelector(LaserExtrinsics)),
+    session: AsyncSession = Depends(get_read_session),
+) -> List[LaserExtrinsics]:
+    """Retrieve the latest laser extrinsics for many dive IDs in one query.
+
+    Dives without laser extrinsics are left out of the result.
+    """
+    logger.debug(
+        "Retrieving latest laser extrinsics for %d dives", len(lookup.dive_ids)
+    )
+    if not lookup.dive_ids:
+        return []
+
+    query = (
+        select_fields(LaserExtrinsics, fields)
+        .where(
+            LaserExtrinsics.dive_id == any_(literal(lookup.dive_ids, ARRAY(Integer)))
+        )
+        .distinct(LaserExtrinsics.dive_id)
+        .order_by(LaserExtrinsics.dive_id, LATEST_FIRST)
+    )
+
+    return respond(await fetch_all(session, query, fields), fields)
 
 
 @app.put("/api/v1/dives/{dive_id}/laser-extrinsics/", status_code=201)
 async def put_laser_extrinsics_for_dive(
     dive_id: int,
     extrinsics: LaserExtrinsics,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update laser extrinsics for a given dive ID."""
     logger.debug("Creating or updating laser extrinsics for dive with id=%d", dive_id)
-    extrinsics = LaserExtrinsics.model_validate(jsonable_encoder(extrinsics))
-    extrinsics.dive_id = dive_id
-
-    extrinsics = await session.merge(extrinsics)
-    await session.flush()
-
-    extrinsics_id = extrinsics.id
+    extrinsics_id = await upsert(
+        session, LaserExtrinsics, extrinsics.model_dump() | {"dive_id": dive_id}
+    )
 
     return extrinsics_id
@@ -1,57 +1,68 @@
 """Fish controller for the FishSense API."""
 
 import logging
+from typing import List
 
 from fastapi import Depends, HTTPException
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fishsense_api.database import get_async_session
+from fishsense_api.cache import cache_key, invalidate_on_commit, table_cache
+from fishsense_api.database import (
+    get_cache_session,
+    get_read_session,
+    get_write_session,
+)
 from fishsense_api.models.fish import Fish
 from fishsense_api.models.measurement import Measurement
 from fishsense_api.models.species import Species
+from fishsense_api.pagination import Page, PageParams, page_params, paginate
+from fishsense_api.projection import FieldSelector, fetch_first, respond, select_fields
 from fishsense_api.server import app
+from fishsense_api.upsert import upsert
 
 logger = logging.getLogger(__name__)
 
+SPECIES_CACHE = table_cache(Species)
+
 
 @app.get("/api/v1/fish/")
 async def get_fish_list(
-    session: AsyncSession = Depends(get_async_session),
-) -> list[Fish]:
-    """Retrieve all fish."""
+    page: PageParams = Depends(page_params),
+    fields: List[str] | None = Depends(FieldSelector(Fish)),
+    session: AsyncSession = Depends(get_read_session),
+) -> Page[Fish] | list[Fish]:
+    """Retrieve all fish, one page at a time."""
     logger.debug("Retrieving all fish")
-    query = select(Fish)
+    query = select_fields(Fish, fields)
 
-    return (await session.exec(query)).all()
+    return respond(await paginate(session, query, Fish.id, page, fields), fields)
 
 
 @app.get("/api/v1/fish/{fish_id}")
 async def get_fish(
-    fish_id: int, session: AsyncSession = Depends(get_async_session)
+    fish_id: int,
+    fields: List[str] | None = Depends(FieldSelector(Fish)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Fish | None:
     """Retrieve a fish by its ID."""
     logger.debug("Retrieving fish with id=%d", fish_id)
-    query = select(Fish).where(Fish.id == fish_id)
+    query = select_fields(Fish, fields).where(Fish.id == fish_id)
 
-    fish = (await session.exec(query)).first()
+    fish = await fetch_first(session, query, fields)
     if fish is None:
         logger.warning("Fish with id=%d not found", fish_id)
         raise HTTPException(status_code=404, detail="Fish not found")
-    return fish
+    return respond(fish, fields)
 
 
 @app.post("/api/v1/fish", status_code=201)
 async def post_fish(
     fish: Fish,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create a new fish."""
     logger.debug("Creating a new fish")
-    fish = await session.merge(fish)
-    await session.flush()
-
-    fish_id = fish.id
+    fish_id = await upsert(session, Fish, fish.model_dump())
 
     return fish_id
 
@@ -60,44 +71,46 @@ async def post_fish(
 async def post_measurement(
     fish_id: int,
     measurement: Measurement,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create a new measurement for a specific fish."""
     logger.debug("Creating a new measurement for fish with id=%d", fish_id)
     measurement.fish_id = fish_id
-    measurement = await session.merge(measurement)
-    await session.flush()
-
-    measurement_id = measurement.id
+    measurement_id = await upsert(session, Measurement, measurement.model_dump())
 
     return measurement_id
 
 
 @app.get("/api/v1/fish/species/{scientific_name}")
 async def get_species_by_scientific_name(
-    scientific_name: str, session: AsyncSession = Depends(get_async_session)
+    scientific_name: str,
+    fields: List[str] | None = Depends(FieldSelector(Species)),
+    session: AsyncSession = Depends(get_cache_session),
 ) -> Species | None:
     """Retrieve a species by its scientific name."""
     logger.debug("Retrieving species with scientific_name=%s", scientific_name)
-    query = select(Species).where(Species.scientific_name == scientific_name)
-
-    species = (await session.exec(query)).first()
+    query = select_fields(Species, fields).where(
+        Species.scientific_name == scientific_name
+    )
+
+    species = await SPECIES_CACHE.get_or_load(
+        cache_key(scientific_name, fields),
+        lambda: fetch_first(session, query, fields),
+    )
     if species is None:
         logger.warning("Species with scientific_name=%s not found", scientific_name)
         raise HTTPException(status_code=404, detail="Species not found")
-    return species
+    return respond(species, fields)
 
 
 @app.post("/api/v1/fish/species", status_code=201)
 async def post_species(
     species: Species,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create a new species."""
     logger.debug("Creating a new species")
-    species = await session.merge(species)
-    await session.flush()
-
-    species_id = species.id
+    species_id = await upsert(session, Species, species.model_dump())
+    await invalidate_on_commit(session, Species)
 
     return species_id
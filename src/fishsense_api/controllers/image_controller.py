@@ -1,77 +1,162 @@
 """Image Controller for FishSense API."""
 
-import asyncio
 import logging
-from typing import Dict, List
+from typing import List
 
-from fastapi import Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
-from sqlmodel import select
+from fastapi import Depends, HTTPException, Query, Request
+from sqlalchemy import Integer, String, all_, any_, func, literal
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fishsense_api.database import get_async_session
+from fishsense_api.database import get_read_session, get_write_session
 from fishsense_api.models.data_source import DataSource
 from fishsense_api.models.dive_frame_cluster import (
     DiveFrameCluster,
     DiveFrameClusterImageMapping,
     DiveFrameClusterJson,
 )
-from fishsense_api.models.image import Image
+from fishsense_api.fast_path import fetch_one_json, json_response
+from fishsense_api.image_copy import copy_images, read_bulk_images
+from fishsense_api.models.dive import Dive
+from fishsense_api.models.image import (
+    BulkImageResult,
+    ChecksumLookup,
+    ChecksumLookupResult,
+    Image,
+)
+from fishsense_api.projection import (
+    FieldSelector,
+    fetch_all,
+    respond,
+    select_fields,
+)
 from fishsense_api.server import app
+from fishsense_api.streaming import stream_ndjson, wants_ndjson
+from fishsense_api.upsert import upsert
 
 logger = logging.getLogger(__name__)
 
 
 @app.get("/api/v1/images/{image_id}")
 async def get_image(
-    image_id: int, session: AsyncSession = Depends(get_async_session)
+    image_id: int,
+    fields: List[str] | None = Depends(FieldSelector(Image)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Image | None:
     """Retrieve an image by its ID."""
     logger.debug("Retrieving image with id=%d", image_id)
-    query = select(Image).where(Image.id == image_id)
-
-    image = (await session.exec(query)).first()
+    image = await fetch_one_json(session, Image, fields, "id", image_id)
     if image is None:
         logger.warning("Image with id=%d not found", image_id)
         raise HTTPException(status_code=404, detail="Image not found")
-    return image
+    return json_response(image)
 
 
 @app.get("/api/v1/images/checksum/{checksum}")
 async def get_image_by_checksum(
-    checksum: str, session: AsyncSession = Depends(get_async_session)
+    checksum: str,
+    fields: List[str] | None = Depends(FieldSelector(Image)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Image | None:
     """Retrieve an image by its checksum."""
     logger.debug("Retrieving image with checksum=%s", checksum)
-    query = select(Image).where(Image.checksum == checksum)
-
-    image = (await session.exec(query)).first()
+    image = await fetch_one_json(session, Image, fields, "checksum", checksum)
     if image is None:
         logger.warning("Image with checksum=%s not found", checksum)
         raise HTTPException(status_code=404, detail="Image not found")
-    return image
+    return json_response(image)
+
+
+@app.post("/api/v1/images/checksums:lookup")
+async def lookup_image_checksums(
+    lookup: ChecksumLookup, session: AsyncSession = Depends(get_read_session)
+) -> ChecksumLookupResult:
+    """Find which of many checksums already belong to an image."""
+    logger.debug("Looking up %d image checksums", len(lookup.checksums))
+    # Each checksum once, so a repeated checksum does not repeat its image ids.
+    unique_checksums = list(dict.fromkeys(lookup.checksums))
+    checksums = func.unnest(literal(unique_checksums, ARRAY(String))).table_valued(
+        "checksum"
+    )
+    query = (
+        select(
+            checksums.c.checksum,
+            func.array_agg(Image.id).filter(Image.id.is_not(None)),
+        )
+        .select_from(checksums)
+        .outerjoin(Image, Image.checksum == checksums.c.checksum)
+        .group_by(checksums.c.checksum)
+    )
+
+    found = {}
+    missing = []
+    for checksum, image_ids in (await session.exec(query)).all():
+        if image_ids:
+            found[checksum] = sorted(image_ids)
+        else:
+            missing.append(checksum)
+    return ChecksumLookupResult(found=found, missing=missing)
 
 
 @app.get("/api/v1/dives/{dive_id}/images/")
 async def get_dive_images(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    request: Request,
+    fields: List[str] | None = Depends(FieldSelector(Image)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[Image] | None:
-    """Retrieve all images associated with a specific dive ID."""
+    """Retrieve all images associated with a specific dive ID.
+
+    Send `Accept: application/x-ndjson` to stream one image per line.
+    """
     logger.debug("Retrieving images for dive with id=%d", dive_id)
-    query = select(Image).where(Image.dive_id == dive_id)
+    query = select_fields(Image, fields).where(Image.dive_id == dive_id)
 
-    images = (await session.exec(query)).all()
+    if wants_ndjson(request):
+        images = await stream_ndjson(session, query, fields)
+    else:
+        images = await fetch_all(session, query, fields)
     if not images:
         logger.warning("Images for dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Images not found")
-    return images
+    return respond(images, fields)
+
+
+@app.post("/api/v1/dives/{dive_id}/images:bulk", status_code=201)
+async def post_dive_images(
+    dive_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_write_session),
+) -> BulkImageResult:
+    """Register many images for a specific dive ID in one COPY.
+
+    The body is a JSON array of images, or one image per line when sent as
+    `Content-Type: application/x-ndjson`. Images whose path is already
+    registered are updated.
+    """
+    logger.debug("Registering images in bulk for dive with id=%d", dive_id)
+    dive = (await session.exec(select(Dive.id).where(Dive.id == dive_id))).first()
+    if dive is None:
+        logger.warning("Dive with id=%d not found", dive_id)
+        raise HTTPException(status_code=404, detail="Dive not found")
+
+    result = await copy_images(session, dive_id, read_bulk_images(request))
+    logger.debug(
+        "Registered images for dive with id=%d: %d inserted, %d updated",
+        dive_id,
+        result.inserted,
+        result.updated,
+    )
+    return result
 
 
 @app.get("/api/v1/dives/{dive_id}/images/clusters/{data_source}")
 async def get_clusters(
     dive_id: int,
     data_source: DataSource,
-    session: AsyncSession = Depends(get_async_session),
+    fields: List[str] | None = Depends(FieldSelector(DiveFrameClusterJson)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[DiveFrameClusterJson] | None:
     """Retrieve all image clusters associated with a specific dive ID."""
     logger.debug(
@@ -79,78 +164,113 @@ async def get_clusters(
         dive_id,
         data_source,
     )
-    query = select(DiveFrameCluster).where(DiveFrameCluster.dive_id == dive_id)
-
-    clusters = (await session.exec(query)).all()
-    cluster_mapping_query = (
-        select(DiveFrameClusterImageMapping)
-        .join(
-            DiveFrameCluster,
-            DiveFrameClusterImageMapping.dive_frame_cluster_id == DiveFrameCluster.id,
-        )
-        .where(DiveFrameCluster.data_source == data_source)
+    requested = fields or list(DiveFrameClusterJson.model_fields)
+    cluster_fields = [name for name in requested if name != "image_ids"]
+    query = (
+        select_fields(DiveFrameCluster, cluster_fields)
         .where(DiveFrameCluster.dive_id == dive_id)
+        .where(DiveFrameCluster.data_source == data_source)
+        .order_by(DiveFrameCluster.id)
     )
-    cluster_mappings = (await session.exec(cluster_mapping_query)).all()
-
-    cluster_mappings_dict: Dict[int, List[DiveFrameClusterImageMapping]] = {}
-    for mappings in cluster_mappings:
-        if mappings.dive_frame_cluster_id not in cluster_mappings_dict:
-            cluster_mappings_dict[mappings.dive_frame_cluster_id] = []
-
-        cluster_mappings_dict[mappings.dive_frame_cluster_id].append(mappings)
-
-    return [
-        DiveFrameClusterJson(
-            id=c.id,
-            image_ids=[m.image_id for m in cluster_mappings_dict[c.id]],
-            data_source=c.data_source,
-            updated_at=c.updated_at,
-            dive_id=c.dive_id,
-            fish_id=c.fish_id,
+    if "image_ids" in requested:
+        image_id = DiveFrameClusterImageMapping.image_id
+        query = (
+            query.add_columns(
+                func.coalesce(
+                    func.array_agg(aggregate_order_by(image_id, image_id)).filter(
+                        image_id.is_not(None)
+                    ),
+                    literal([], ARRAY(Integer)),
+                ).label("image_ids")
+            )
+            .outerjoin(
+                DiveFrameClusterImageMapping,
+                DiveFrameClusterImageMapping.dive_frame_cluster_id
+                == DiveFrameCluster.id,
+            )
+            .group_by(DiveFrameCluster.id)
+        )
+
+    return respond(await fetch_all(session, query, requested), fields)
+
+
+async def _map_cluster_images(
+    session: AsyncSession,
+    dive_frame_cluster_id: int,
+    image_ids: List[int],
+    replace: bool = False,
+) -> None:
+    """Point a cluster at exactly the given images, touching only changed rows.
+
+    Ids that do not belong to an existing image are ignored.
+
+    Args:
+        session (AsyncSession): The database session.
+        dive_frame_cluster_id (int): The cluster to update.
+        image_ids (List[int]): The images the cluster should contain.
+        replace (bool): Remove mappings to images not in `image_ids`.
+    """
+    image_ids = (
+        (
+            await session.exec(
+                select(Image.id).where(
+                    Image.id == any_(literal(image_ids, ARRAY(Integer)))
+                )
+            )
+        ).all()
+        if image_ids
+        else []
+    )
+
+    if replace:
+        await session.exec(
+            delete(DiveFrameClusterImageMapping)
+            .where(
+                DiveFrameClusterImageMapping.dive_frame_cluster_id
+                == dive_frame_cluster_id
+            )
+            .where(
+                DiveFrameClusterImageMapping.image_id
+                != all_(literal(image_ids, ARRAY(Integer)))
+            )
+        )
+
+    if image_ids:
+        await session.exec(
+            insert(DiveFrameClusterImageMapping)
+            .from_select(
+                ["dive_frame_cluster_id", "image_id"],
+                select(
+                    literal(dive_frame_cluster_id, Integer),
+                    func.unnest(literal(image_ids, ARRAY(Integer))),
+                ),
+            )
+            .on_conflict_do_nothing()
         )
-        for c in clusters
-    ]
 
 
 @app.post("/api/v1/dives/{dive_id}/images/clusters/", status_code=201)
 async def post_cluster(
     dive_id: int,
     dive_frame_cluster: DiveFrameClusterJson,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create a new image cluster for a specific dive ID."""
     logger.debug("Creating a new image cluster for dive with id=%d", dive_id)
-    dive_frame_cluster = DiveFrameClusterJson.model_validate(
-        jsonable_encoder(dive_frame_cluster)
+    dive_frame_cluster_id = await upsert(
+        session,
+        DiveFrameCluster,
+        {
+            "dive_id": dive_id,
+            "data_source": dive_frame_cluster.data_source,
+            "updated_at": dive_frame_cluster.updated_at,
+            "fish_id": dive_frame_cluster.fish_id,
+        },
     )
-    images = (
-        await session.exec(
-            select(Image).where(
-                Image.id.in_(dive_frame_cluster.image_ids)  # pylint: disable=no-member
-            )
-        )
-    ).all()
 
-    dive_frame_cluster = DiveFrameCluster(
-        dive_id=dive_id,
-        data_source=dive_frame_cluster.data_source,
-        updated_at=dive_frame_cluster.updated_at,
-        fish_id=dive_frame_cluster.fish_id,
+    await _map_cluster_images(
+        session, dive_frame_cluster_id, dive_frame_cluster.image_ids
     )
-    dive_frame_cluster = await session.merge(dive_frame_cluster)
-    await session.flush()  # Ensure ID is populated
-
-    dive_frame_cluster_id = dive_frame_cluster.id  # Access ID to ensure it's loaded
-
-    mappings = []
-    for image in images:
-        mapping = DiveFrameClusterImageMapping(
-            dive_frame_cluster_id=dive_frame_cluster.id, image_id=image.id
-        )
-        mappings.append(mapping)
-
-    session.add_all(mappings)
 
     return dive_frame_cluster_id
 
@@ -160,7 +280,7 @@ async def put_cluster(
     dive_id: int,
     dive_frame_cluster_id: int,
     dive_frame_cluster: DiveFrameClusterJson,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Update an existing image cluster for a specific dive ID."""
     logger.debug(
@@ -168,44 +288,115 @@ async def put_cluster(
         dive_frame_cluster_id,
         dive_id,
     )
-    dive_frame_cluster = DiveFrameClusterJson.model_validate(
-        jsonable_encoder(dive_frame_cluster)
+    dive_frame_cluster_id = await upsert(
+        session,
+        DiveFrameCluster,
+        {
+            "id": dive_frame_cluster_id,
+            "dive_id": dive_id,
+            "data_source": dive_frame_cluster.data_source,
+            "updated_at": dive_frame_cluster.updated_at,
+            "fish_id": dive_frame_cluster.fish_id,
+        },
+    )
+
+    await _map_cluster_images(
+        session, dive_frame_cluster_id, dive_frame_cluster.image_ids, replace=True
     )
-    images = (
+
+    return dive_frame_cluster_id
+
+
+@app.post("/api/v1/dives/{dive_id}/images/clusters:bulk", status_code=201)
+async def post_clusters(
+    dive_id: int,
+    dive_frame_clusters: List[DiveFrameClusterJson],
+    replace: DataSource | None = Query(
+        default=None,
+        description="Delete every existing cluster from this data source first.",
+    ),
+    session: AsyncSession = Depends(get_write_session),
+) -> List[int]:
+    """Create many image clusters for a specific dive ID in one transaction.
+
+    Cluster ids in the body are ignored; every cluster is created. The ids of
+    the new clusters are returned in input order.
+    """
+    logger.debug(
+        "Creating %d image clusters in bulk for dive with id=%d",
+        len(dive_frame_clusters),
+        dive_id,
+    )
+    dive = (await session.exec(select(Dive.id).where(Dive.id == dive_id))).first()
+    if dive is None:
+        logger.warning("Dive with id=%d not found", dive_id)
+        raise HTTPException(status_code=404, detail="Dive not found")
+
+    if replace is not None:
+        replaced = select(DiveFrameCluster.id).where(
+            DiveFrameCluster.dive_id == dive_id,
+            DiveFrameCluster.data_source == replace,
+        )
         await session.exec(
-            select(Image).where(
-                Image.id.in_(dive_frame_cluster.image_ids)  # pylint: disable=no-member
+            delete(DiveFrameClusterImageMapping).where(
+                DiveFrameClusterImageMapping.dive_frame_cluster_id.in_(replaced)
             )
         )
-    ).all()
-
-    dive_frame_cluster = DiveFrameCluster(
-        id=dive_frame_cluster_id,
-        dive_id=dive_id,
-        data_source=dive_frame_cluster.data_source,
-        updated_at=dive_frame_cluster.updated_at,
-        fish_id=dive_frame_cluster.fish_id,
-    )
-    dive_frame_cluster = await session.merge(dive_frame_cluster)
-    await session.flush()  # Ensure ID is populated
+        await session.exec(
+            delete(DiveFrameCluster).where(DiveFrameCluster.id.in_(replaced))
+        )
 
-    # Clear existing mappings
-    mappings_to_delete = await session.exec(
-        select(DiveFrameClusterImageMapping).where(
-            DiveFrameClusterImageMapping.dive_frame_cluster_id == dive_frame_cluster.id
+    if not dive_frame_clusters:
+        return []
+
+    cluster_ids = (
+        (
+            await session.exec(
+                insert(DiveFrameCluster).returning(
+                    DiveFrameCluster.id, sort_by_parameter_order=True
+                ),
+                params=[
+                    {
+                        "dive_id": dive_id,
+                        "data_source": cluster.data_source,
+                        "updated_at": cluster.updated_at,
+                        "fish_id": cluster.fish_id,
+                    }
+                    for cluster in dive_frame_clusters
+                ],
+            )
         )
-    )
-    await asyncio.gather(
-        *[session.delete(mapping) for mapping in mappings_to_delete.all()]
+        .scalars()
+        .all()
     )
 
-    mappings = []
-    for image in images:
-        mapping = DiveFrameClusterImageMapping(
-            dive_frame_cluster_id=dive_frame_cluster.id, image_id=image.id
+    requested_ids = {i for cluster in dive_frame_clusters for i in cluster.image_ids}
+    image_ids = (
+        set(
+            (
+                await session.exec(
+                    select(Image.id).where(
+                        Image.id == any_(literal(list(requested_ids), ARRAY(Integer)))
+                    )
+                )
+            ).all()
         )
-        mappings.append(mapping)
-
-    session.add_all(mappings)
+        if requested_ids
+        else set()
+    )
+    mappings = [
+        {"dive_frame_cluster_id": cluster_id, "image_id": image_id}
+        for cluster_id, cluster in zip(cluster_ids, dive_frame_clusters)
+        for image_id in dict.fromkeys(cluster.image_ids)
+        if image_id in image_ids
+    ]
+    if mappings:
+        await session.exec(insert(DiveFrameClusterImageMapping), params=mappings)
 
-    return dive_frame_cluster.id
+    logger.debug(
+        "Created %d image clusters with %d images for dive with id=%d",
+        len(cluster_ids),
+        len(mappings),
+        dive_id,
+    )
+    return cluster_ids
@@ -4,288 +4,413 @@
 import logging
 from typing import List
 
-from fastapi import Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
-from sqlmodel import select
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import not_
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fishsense_api.database import get_async_session
+from fishsense_api.database import get_read_session, get_write_session
+from fishsense_api.fast_path import fetch_one_json, json_response
+from fishsense_api.models.bulk_upsert_result import BulkUpsertResult
 from fishsense_api.models.dive import Dive
 from fishsense_api.models.dive_slate_label import DiveSlateLabel
 from fishsense_api.models.head_tail_label import HeadTailLabel
 from fishsense_api.models.image import Image
 from fishsense_api.models.laser_label import LaserLabel
 from fishsense_api.models.species_label import SpeciesLabel
+from fishsense_api.projection import (
+    DeferredFieldSelector,
+    fetch_all,
+    fetch_first,
+    respond,
+    select_fields,
+)
 from fishsense_api.server import app
+from fishsense_api.upsert import bulk_upsert, upsert
+from fishsense_api.streaming import stream_ndjson, wants_ndjson
 
 logger = logging.getLogger(__name__)
 
 
 @app.get("/api/v1/labels/dive-slate/{image_id}")
 async def get_dive_slate_label(
-    image_id: int, session: AsyncSession = Depends(get_async_session)
+    image_id: int,
+    fields: List[str] | None = Depends(DeferredFieldSelector(DiveSlateLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> DiveSlateLabel | None:
     """Retrieve slate label for a given image ID."""
     logger.debug("Retrieving dive slate label for image with id=%d", image_id)
 
-    query = select(DiveSlateLabel).where(DiveSlateLabel.image_id == image_id)
+    query = select_fields(DiveSlateLabel, fields).where(
+        DiveSlateLabel.image_id == image_id
+    )
 
-    return (await session.exec(query)).first()
+    return respond(await fetch_first(session, query, fields), fields)
 
 
 @app.get("/api/v1/dives/{dive_id}/labels/dive-slate")
 async def get_dive_slate_labels_for_dive(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    request: Request,
+    fields: List[str] | None = Depends(DeferredFieldSelector(DiveSlateLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[DiveSlateLabel]:
-    """Retrieve all slate labels for a given dive ID."""
+    """Retrieve all slate labels for a given dive ID.
+
+    Send `Accept: application/x-ndjson` to stream one label per line.
+    """
     logger.debug("Retrieving dive slate labels for dive with id=%d", dive_id)
     query = (
-        select(DiveSlateLabel)
+        select_fields(DiveSlateLabel, fields)
         .join_from(DiveSlateLabel, Image, DiveSlateLabel.image_id == Image.id)
         .join_from(Image, Dive, Image.dive_id == Dive.id)
         .where(Dive.id == dive_id)
     )
 
-    labels = (await session.exec(query)).all()
+    if wants_ndjson(request):
+        labels = await stream_ndjson(session, query, fields)
+    else:
+        labels = await fetch_all(session, query, fields)
     if not labels:
         logger.warning("Dive slate labels for dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Labels not found")
-    return labels
+    return respond(labels, fields)
 
 
 @app.put("/api/v1/labels/dive-slate/{image_id}", status_code=201)
 async def put_dive_slate_label(
     image_id: int,
     label: DiveSlateLabel,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update slate label for a given image ID."""
     logger.debug("Creating or updating dive slate label for image with id=%d", image_id)
-    label = DiveSlateLabel.model_validate(jsonable_encoder(label))
-    label.image_id = image_id
+    label_id = await upsert(
+        session,
+        DiveSlateLabel,
+        label.model_dump() | {"image_id": image_id},
+        constraint="uq_dive_slate_image_project",
+    )
+
+    return label_id
 
-    label = await session.merge(label)
-    await session.flush()
 
-    label_id = label.id
+@app.put("/api/v1/labels/dive-slate:bulk")
+async def put_dive_slate_labels(
+    labels: List[DiveSlateLabel],
+    session: AsyncSession = Depends(get_write_session),
+) -> List[BulkUpsertResult]:
+    """Create or update many dive slate labels in one transaction.
 
-    return label_id
+    Labels are matched on image_id and label_studio_project_id.
+    """
+    logger.debug("Bulk creating or updating %d dive slate labels", len(labels))
+
+    return await bulk_upsert(
+        session,
+        DiveSlateLabel,
+        [label.model_dump() for label in labels],
+        constraint="uq_dive_slate_image_project",
+    )
 
 
 @app.get("/api/v1/labels/headtail/{image_id}")
 async def get_headtail_label(
-    image_id: int, session: AsyncSession = Depends(get_async_session)
+    image_id: int,
+    fields: List[str] | None = Depends(DeferredFieldSelector(HeadTailLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> HeadTailLabel | None:
     """Retrieve a head-tail label for a given image ID."""
     logger.debug("Retrieving head-tail label for image with id=%d", image_id)
 
-    query = (
-        select(HeadTailLabel)
-        .where(HeadTailLabel.image_id == image_id)
-        .where(HeadTailLabel.superseded == False)
+    label = await fetch_one_json(
+        session,
+        HeadTailLabel,
+        fields,
+        "image_id",
+        image_id,
+        superseded=False,
     )
-
-    label = (await session.exec(query)).first()
     if label is None:
         logger.warning("Head-tail label for image with id=%d not found", image_id)
         raise HTTPException(status_code=404, detail="Label not found")
-    return label
+    return json_response(label)
 
 
 @app.get("/api/v1/dives/{dive_id}/labels/headtail")
 async def get_headtail_labels_for_dive(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    request: Request,
+    fields: List[str] | None = Depends(DeferredFieldSelector(HeadTailLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[HeadTailLabel]:
-    """Retrieve all head-tail labels for a given dive ID."""
+    """Retrieve all head-tail labels for a given dive ID.
+
+    Send `Accept: application/x-ndjson` to stream one label per line.
+    """
     logger.debug("Retrieving head-tail labels for dive with id=%d", dive_id)
     query = (
-        select(HeadTailLabel)
+        select_fields(HeadTailLabel, fields)
         .join_from(HeadTailLabel, Image, HeadTailLabel.image_id == Image.id)
         .join_from(Image, Dive, Image.dive_id == Dive.id)
         .where(Dive.id == dive_id)
-        .where(HeadTailLabel.superseded == False)
+        .where(not_(HeadTailLabel.superseded))
     )
 
-    labels = (await session.exec(query)).all()
+    if wants_ndjson(request):
+        labels = await stream_ndjson(session, query, fields)
+    else:
+        labels = await fetch_all(session, query, fields)
     if not labels:
         logger.warning("Head-tail labels for dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Labels not found")
-    return labels
+    return respond(labels, fields)
 
 
 @app.put("/api/v1/labels/headtail/{image_id}", status_code=201)
 async def put_headtail_label(
     image_id: int,
     label: HeadTailLabel,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update a head-tail label for a given image ID."""
     logger.debug("Creating or updating head-tail label for image with id=%d", image_id)
-    label = HeadTailLabel.model_validate(jsonable_encoder(label))
-    label.image_id = image_id
+    label_id = await upsert(
+        session,
+        HeadTailLabel,
+        label.model_dump() | {"image_id": image_id},
+        constraint="uq_headtail_image_project",
+    )
+
+    return label_id
 
-    label = await session.merge(label)
-    await session.flush()
 
-    label_id = label.id
+@app.put("/api/v1/labels/headtail:bulk")
+async def put_headtail_labels(
+    labels: List[HeadTailLabel],
+    session: AsyncSession = Depends(get_write_session),
+) -> List[BulkUpsertResult]:
+    """Create or update many head-tail labels in one transaction.
 
-    return label_id
+    Labels are matched on image_id and label_studio_project_id.
+    """
+    logger.debug("Bulk creating or updating %d head-tail labels", len(labels))
+
+    return await bulk_upsert(
+        session,
+        HeadTailLabel,
+        [label.model_dump() for label in labels],
+        constraint="uq_headtail_image_project",
+    )
 
 
 @app.get("/api/v1/labels/headtail/label-studio/{label_studio_id}")
 async def get_headtail_label_by_label_studio_id(
-    label_studio_id: int, session: AsyncSession = Depends(get_async_session)
+    label_studio_id: int,
+    fields: List[str] | None = Depends(DeferredFieldSelector(HeadTailLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> HeadTailLabel | None:
     """Retrieve a head-tail label for a given Label Studio ID."""
-    logger.debug(
-        "Retrieving head-tail label for Label Studio id=%d", label_studio_id
-    )
+    logger.debug("Retrieving head-tail label for Label Studio id=%d", label_studio_id)
     query = (
-        select(HeadTailLabel)
+        select_fields(HeadTailLabel, fields)
         .where(HeadTailLabel.label_studio_task_id == label_studio_id)
-        .where(HeadTailLabel.superseded == False)
+        .where(not_(HeadTailLabel.superseded))
     )
 
-    label = (await session.exec(query)).first()
+    label = await fetch_first(session, query, fields)
     if label is None:
         logger.warning(
             "Head-tail label for Label Studio id=%d not found", label_studio_id
         )
         raise HTTPException(status_code=404, detail="Label not found")
-    return label
+    return respond(label, fields)
 
 
 @app.get("/api/v1/labels/laser/{image_id}")
 async def get_laser_label(
-    image_id: int, session: AsyncSession = Depends(get_async_session)
+    image_id: int,
+    fields: List[str] | None = Depends(DeferredFieldSelector(LaserLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> LaserLabel | None:
     """Retrieve a laser label for a given image ID."""
     logger.debug("Retrieving laser label for image with id=%d", image_id)
 
-    query = (
-        select(LaserLabel)
-        .where(LaserLabel.image_id == image_id)
-        .where(LaserLabel.superseded == False)
+    label = await fetch_one_json(
+        session, LaserLabel, fields, "image_id", image_id, superseded=False
     )
-
-    label = (await session.exec(query)).first()
     if label is None:
         logger.warning("Laser label for image with id=%d not found", image_id)
         raise HTTPException(status_code=404, detail="Label not found")
-    return label
+    return json_response(label)
 
 
 @app.get("/api/v1/labels/laser/label-studio/{label_studio_id}")
 async def get_laser_label_by_label_studio_id(
-    label_studio_id: int, session: AsyncSession = Depends(get_async_session)
+    label_studio_id: int,
+    fields: List[str] | None = Depends(DeferredFieldSelector(LaserLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> LaserLabel | None:
     """Retrieve a laser label for a given Label Studio ID."""
     logger.debug("Retrieving laser label for Label Studio id=%d", label_studio_id)
 
     query = (
-        select(LaserLabel)
+        select_fields(LaserLabel, fields)
         .where(LaserLabel.label_studio_task_id == label_studio_id)
-        .where(LaserLabel.superseded == False)
+        .where(not_(LaserLabel.superseded))
     )
 
-    label = (await session.exec(query)).first()
+    label = await fetch_first(session, query, fields)
     if label is None:
-        logger.warning(
-            "Laser label for Label Studio id=%d not found", label_studio_id
-        )
+        logger.warning("Laser label for Label Studio id=%d not found", label_studio_id)
         raise HTTPException(status_code=404, detail="Label not found")
-    return label
+    return respond(label, fields)
 
 
 @app.get("/api/v1/dives/{dive_id}/labels/laser")
 async def get_laser_labels_for_dive(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    request: Request,
+    fields: List[str] | None = Depends(DeferredFieldSelector(LaserLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[LaserLabel]:
-    """Retrieve all laser labels for a given dive ID."""
+    """Retrieve all laser labels for a given dive ID.
+
+    Send `Accept: application/x-ndjson` to stream one label per line.
+    """
     logger.debug("Retrieving laser labels for dive with id=%d", dive_id)
     query = (
-        select(LaserLabel)
+        select_fields(LaserLabel, fields)
         .join_from(LaserLabel, Image, LaserLabel.image_id == Image.id)
         .join_from(Image, Dive, Image.dive_id == Dive.id)
         .where(Dive.id == dive_id)
-        .where(LaserLabel.superseded == False)
+        .where(not_(LaserLabel.superseded))
     )
 
-    labels = (await session.exec(query)).all()
+    if wants_ndjson(request):
+        labels = await stream_ndjson(session, query, fields)
+    else:
+        labels = await fetch_all(session, query, fields)
     if not labels:
         logger.warning("Laser labels for dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Labels not found")
-    return labels
+    return respond(labels, fields)
 
 
 @app.put("/api/v1/labels/laser/{image_id}", status_code=201)
 async def put_laser_label(
     image_id: int,
     label: LaserLabel,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update a laser label for a given image ID."""
     logger.debug("Creating or updating laser label for image with id=%d", image_id)
-    label = LaserLabel.model_validate(jsonable_encoder(label))
-    label.image_id = image_id
+    label_id = await upsert(
+        session,
+        LaserLabel,
+        label.model_dump() | {"image_id": image_id},
+        constraint="uq_laser_image_project",
+    )
 
-    label = await session.merge(label)
-    await session.flush()
+    return label_id
 
-    label_id = label.id
 
-    return label_id
+@app.put("/api/v1/labels/laser:bulk")
+async def put_laser_labels(
+    labels: List[LaserLabel],
+    session: AsyncSession = Depends(get_write_session),
+) -> List[BulkUpsertResult]:
+    """Create or update many laser labels in one transaction.
+
+    Labels are matched on image_id and label_studio_project_id.
+    """
+    logger.debug("Bulk creating or updating %d laser labels", len(labels))
+
+    return await bulk_upsert(
+        session,
+        LaserLabel,
+        [label.model_dump() for label in labels],
+        constraint="uq_laser_image_project",
+    )
 
 
 @app.get("/api/v1/dives/{dive_id}/labels/species")
 async def get_species_labels_for_dive(
-    dive_id: int, session: AsyncSession = Depends(get_async_session)
+    dive_id: int,
+    request: Request,
+    fields: List[str] | None = Depends(DeferredFieldSelector(SpeciesLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[SpeciesLabel]:
-    """Retrieve all species labels for a given dive ID."""
+    """Retrieve all species labels for a given dive ID.
+
+    Send `Accept: application/x-ndjson` to stream one label per line.
+    """
     logger.debug("Retrieving species labels for dive with id=%d", dive_id)
     query = (
-        select(SpeciesLabel)
+        select_fields(SpeciesLabel, fields)
         .join_from(SpeciesLabel, Image, SpeciesLabel.image_id == Image.id)
         .join_from(Image, Dive, Image.dive_id == Dive.id)
         .where(Dive.id == dive_id)
     )
 
-    labels = (await session.exec(query)).all()
+    if wants_ndjson(request):
+        labels = await stream_ndjson(session, query, fields)
+    else:
+        labels = await fetch_all(session, query, fields)
     if not labels:
         logger.warning("Species labels for dive with id=%d not found", dive_id)
         raise HTTPException(status_code=404, detail="Labels not found")
-    return labels
+    return respond(labels, fields)
 
 
 @app.get("/api/v1/labels/species/{image_id}")
 async def get_species_label(
-    image_id: int, session: AsyncSession = Depends(get_async_session)
+    image_id: int,
+    fields: List[str] | None = Depends(DeferredFieldSelector(SpeciesLabel)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> SpeciesLabel | None:
     """Retrieve a species label for a given image ID."""
     logger.debug("Retrieving species label for image with id=%d", image_id)
-    query = select(SpeciesLabel).where(SpeciesLabel.image_id == image_id)
+    query = select_fields(SpeciesLabel, fields).where(SpeciesLabel.image_id == image_id)
 
-    label = (await session.exec(query)).first()
+    label = await fetch_first(session, query, fields)
     if label is None:
         logger.warning("Species label for image with id=%d not found", image_id)
         raise HTTPException(status_code=404, detail="Label not found")
-    return label
+    return respond(label, fields)
 
 
 @app.put("/api/v1/labels/species/{image_id}", status_code=201)
 async def put_species_label(
     image_id: int,
     label: SpeciesLabel,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update a species label for a given image ID."""
     logger.debug("Creating or updating species label for image with id=%d", image_id)
-    label = SpeciesLabel.model_validate(jsonable_encoder(label))
-    label.image_id = image_id
+    label_id = await upsert(
+        session,
+        SpeciesLabel,
+        label.model_dump() | {"image_id": image_id},
+        constraint="uq_species_image_project",
+    )
 
-    label = await session.merge(label)
-    await session.flush()
+    return label_id
 
-    label_id = label.id
 
-    return label_id
+@app.put("/api/v1/labels/species:bulk")
+async def put_species_labels(
+    labels: List[SpeciesLabel],
+    session: AsyncSession = Depends(get_write_session),
+) -> List[BulkUpsertResult]:
+    """Create or update many species labels in one transaction.
+
+    Labels are matched on image_id and label_studio_project_id.
+    """
+    logger.debug("Bulk creating or updating %d species labels", len(labels))
+
+    return await bulk_upsert(
+        session,
+        SpeciesLabel,
+        [label.model_dump() for label in labels],
+        constraint="uq_species_image_project",
+    )
@@ -4,55 +4,73 @@ import logging
 from typing import List
 
 from fastapi import Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fishsense_api.database import get_async_session
+from fishsense_api.cache import cache_key, invalidate_on_commit, table_cache
+from fishsense_api.database import (
+    get_cache_session,
+    get_read_session,
+    get_write_session,
+)
+from fishsense_api.fast_path import fetch_one_json, json_response
 from fishsense_api.models.user import User
+from fishsense_api.pagination import Page, PageParams, page_params, paginate
+from fishsense_api.projection import FieldSelector, fetch_first, respond, select_fields
 from fishsense_api.server import app
+from fishsense_api.upsert import upsert
 
 logger = logging.getLogger(__name__)
 
+USER_CACHE = table_cache(User)
+
 
 @app.get("/api/v1/users/")
-async def get_users(session: AsyncSession = Depends(get_async_session)) -> List[User]:
-    """Retrieve all users."""
+async def get_users(
+    page: PageParams = Depends(page_params),
+    fields: List[str] | None = Depends(FieldSelector(User)),
+    session: AsyncSession = Depends(get_read_session),
+) -> Page[User] | List[User]:
+    """Retrieve all users, one page at a time."""
     logger.debug("Retrieving all users")
 
-    query = select(User)
-    results = await session.exec(query)
-    return results.all()
+    query = select_fields(User, fields)
+    return respond(await paginate(session, query, User.id, page, fields), fields)
 
 
 @app.get("/api/v1/users/{user_id}")
 async def get_user(
-    user_id: int, session: AsyncSession = Depends(get_async_session)
+    user_id: int,
+    fields: List[str] | None = Depends(FieldSelector(User)),
+    session: AsyncSession = Depends(get_read_session),
 ) -> User | None:
     """Retrieve a user by their ID."""
     logger.debug("Retrieving user with id=%d", user_id)
 
-    query = select(User).where(User.id == user_id)
-    result = await session.exec(query)
-    user = result.first()
+    query = select_fields(User, fields).where(User.id == user_id)
+    user = await fetch_first(session, query, fields)
     logger.debug("Query result for user with id=%d: %s", user_id, user)
     if user is None:
         logger.warning("User with id=%d not found; raising HTTPException 404", user_id)
         raise HTTPException(status_code=404, detail="User not found")
     logger.debug("User with id=%d found successfully", user_id)
-    return user
+    return respond(user, fields)
 
 
 @app.get("/api/v1/users/label-studio/{label_studio_id}")
 async def get_user_by_label_studio_id(
-    label_studio_id: int, session: AsyncSession = Depends(get_async_session)
+    label_studio_id: int,
+    fields: List[str] | None = Depends(FieldSelector(User)),
+    session: AsyncSession = Depends(get_cache_session),
 ) -> User | None:
     """Retrieve a user by their Label Studio ID."""
     logger.debug("Retrieving user with label_studio_id=%d", label_studio_id)
 
-    query = select(User).where(User.label_studio_id == label_studio_id)
-    result = await session.exec(query)
-    user = result.first()
+    user = await USER_CACHE.get_or_load(
+        cache_key("label_studio_id", label_studio_id, fields),
+        lambda: fetch_one_json(
+            session, User, fields, "label_studio_id", label_studio_id
+        ),
+    )
     logger.debug(
         "Query result for user with label_studio_id=%d: %s", label_studio_id, user
     )
@@ -63,42 +81,43 @@ async def get_user_by_label_studio_id(
         )
         raise HTTPException(status_code=404, detail="User not found")
     logger.debug("User with label_studio_id=%d found successfully", label_studio_id)
-    return user
+    return json_response(user)
 
 
 @app.get("/api/v1/users/email/{email}")
 async def get_user_by_email(
-    email: str, session: AsyncSession = Depends(get_async_session)
+    email: str,
+    fields: List[str] | None = Depends(FieldSelector(User)),
+    session: AsyncSession = Depends(get_cache_session),
 ) -> User | None:
     """Retrieve a user by their email."""
     logger.debug("Retrieving user by email")
 
-    query = select(User).where(User.email == email)
-    result = await session.exec(query)
-    user = result.first()
+    query = select_fields(User, fields).where(User.email == email)
+    user = await USER_CACHE.get_or_load(
+        cache_key("email", email, fields),
+        lambda: fetch_first(session, query, fields),
+    )
     logger.debug("Query result for user by email: %s", user)
     if user is None:
         logger.warning("User not found for provided email; raising HTTPException 404")
         raise HTTPException(status_code=404, detail="User not found")
     logger.debug("User found successfully by email")
-    return user
+    return respond(user, fields)
 
 
 @app.post("/api/v1/users/", status_code=201)
 async def create_user(
-    user: User, session: AsyncSession = Depends(get_async_session)
+    user: User, session: AsyncSession = Depends(get_write_session)
 ) -> int:
     """Create a new user."""
     logger.debug("Creating a new user with label_studio_id=%s", user.label_studio_id)
     try:
-        user = User.model_validate(jsonable_encoder(user))
-        logger.debug(
-            "Validated user model with label_studio_id=%s", user.label_studio_id
-        )
         session.add(user)
         logger.debug("User added to session; flushing to persist")
         await session.flush()
         await session.refresh(user)
+        await invalidate_on_commit(session, User)
         logger.debug("User created successfully with id=%s", user.id)
         return user.id
     except Exception:
@@ -110,16 +129,11 @@ async def create_user(
 async def create_or_update_user(
     user_id: int,
     user: User,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> int:
     """Create or update a user by their ID."""
     logger.debug("Creating or updating user with id=%d", user_id)
-    user = User.model_validate(jsonable_encoder(user))
-    user.id = user_id
-
-    user = await session.merge(user)
-    await session.flush()
-
-    user_id = user.id
+    user_id = await upsert(session, User, user.model_dump() | {"id": user_id})
+    await invalidate_on_commit(session, User)
 
     return user_id
@@ -4,14 +4,28 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
+import time
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
+import asyncpg
+from fastapi import Request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from fishsense_api.config import PG_CONNECTION_STRING
+from fishsense_api.config import (
+    PG_CONNECTION_STRING,
+    PG_REPLICA_CONNECTION_STRINGS,
+    settings,
+)
+from fishsense_api.instrumentation import instrument_engine
+from fishsense_api.metrics import Counter, Gauge, Histogram
 from fishsense_api.models.camera import Camera
 from fishsense_api.models.camera_intrinsics import CameraIntrinsics
 from fishsense_api.models.dive import Dive
@@ -32,19 +46,58 @@ from fishsense_api.models.species_label import SpeciesLabel
 from fishsense_api.models.user import User
 
 
+POOL_CHECKOUT_SECONDS = Histogram(
+    "fishsense_db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ("engine",),
+)
+POOL_TIMEOUTS = Counter(
+    "fishsense_db_pool_timeouts_total",
+    "Connection checkouts that gave up after pool_timeout.",
+    ("engine",),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Connection pool that records checkout wait times and timeouts.
+
+    Metrics are labelled with the pool's logging name, which `Database` sets to
+    the engine's name.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc(engine=self.logging_name)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(
+                time.perf_counter() - start, engine=self.logging_name
+            )
+
+
 class Database:
     # pylint: disable=too-few-public-methods
 
     """Database interaction class for FishSense API Workflow Worker."""
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, name: str = "primary"):
+        self.name = name
         self.engine = create_async_engine(
             database_url,
-            pool_size=5,  # Maintain a minimum of 5 connections in the pool
-            max_overflow=2,  # Allow up to 2 additional connections beyond pool_size
-            pool_timeout=30,  # Wait up to 30 seconds for a connection before raising an error
-            pool_recycle=3600,  # Recycle connections after 1 hour to prevent stale connections
-            pool_pre_ping=True,  # pre-ping to check if connections are alive before using them
+            poolclass=InstrumentedPool,
+            pool_logging_name=name,
+            pool_size=settings.postgres.pool_size,
+            max_overflow=settings.postgres.max_overflow,
+            pool_timeout=settings.postgres.pool_timeout,
+            pool_recycle=settings.postgres.pool_recycle,
+            pool_pre_ping=settings.postgres.pool_pre_ping,
+        )
+        instrument_engine(self.engine)
+        self.session_maker = sessionmaker(
+            self.engine, class_=AsyncSession, expire_on_commit=False
         )
 
     async def init_database(self, conn: AsyncSession) -> None:
@@ -57,21 +110,149 @@ class Database:
 
 
 DATABASE = Database(PG_CONNECTION_STRING)
-__ASYNC_SESSION_LOCAL = sessionmaker(
-    DATABASE.engine, class_=AsyncSession, expire_on_commit=False
-)
+REPLICAS = [
+    Database(url, name=f"replica-{index}")
+    for index, url in enumerate(PG_REPLICA_CONNECTION_STRINGS)
+]
+__NEXT_REPLICA = itertools.cycle(REPLICAS)
 
+# Clients that wrote recently carry this cookie, and their reads go to the
+# primary until it expires so they never see a replica that is behind.
+READ_PRIMARY_COOKIE = "fishsense_read_primary"
+_WROTE_TO_PRIMARY = "fishsense_wrote_to_primary"
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """A context manager for getting a session.
+Gauge(
+    "fishsense_db_pool_size",
+    "Connections the pool keeps open.",
+    lambda: {(db.name,): db.engine.pool.size() for db in [DATABASE, *REPLICAS]},
+    ("engine",),
+)
+Gauge(
+    "fishsense_db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    lambda: {(db.name,): db.engine.pool.checkedout() for db in [DATABASE, *REPLICAS]},
+    ("engine",),
+)
+Gauge(
+    "fishsense_db_pool_overflow",
+    "Connections open beyond pool_size; negative while the pool is filling.",
+    lambda: {(db.name,): db.engine.pool.overflow() for db in [DATABASE, *REPLICAS]},
+    ("engine",),
+)
 
-    Yields:
-        AsyncSession: An asynchronous database session.
-    """
-    async with __ASYNC_SESSION_LOCAL() as session:
+
+@asynccontextmanager
+async def _session(database: Database) -> AsyncGenerator[AsyncSession, None]:
+    async with database.session_maker() as session:
         try:
             yield session
             await session.commit()
         except:
             await session.rollback()
             raise
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """A context manager for getting a session for reads.
+
+    Sessions come from the read replicas in turn, or from the primary when there
+    are no replicas or the client wrote recently.
+
+    Args:
+        request (Request): The current request.
+
+    Yields:
+        AsyncSession: An asynchronous database session.
+    """
+    if not REPLICAS or READ_PRIMARY_COOKIE in request.cookies:
+        database = DATABASE
+    else:
+        database = next(__NEXT_REPLICA)
+
+    async with _session(database) as session:
+        yield session
+
+
+async def get_write_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """A context manager for getting a session on the primary.
+
+    Marks the request so `ReadYourWritesMiddleware` sends the client's next
+    reads to the primary as well.
+
+    Args:
+        request (Request): The current request.
+
+    Yields:
+        AsyncSession: An asynchronous database session.
+    """
+    setattr(request.state, _WROTE_TO_PRIMARY, True)
+
+    async with _session(DATABASE) as session:
+        yield session
+
+
+async def get_cache_session() -> AsyncGenerator[AsyncSession, None]:
+    """A context manager for getting a primary session for cached lookups.
+
+    Lookups that fill a shared cache read from the primary, so a miss right
+    after an invalidation cannot re-cache a row from a replica that is behind.
+    Unlike `get_write_session`, the client's later reads are not pinned.
+
+    Yields:
+        AsyncSession: An asynchronous database session.
+    """
+    async with _session(DATABASE) as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    # pylint: disable=too-few-public-methods
+    """ASGI middleware pinning a client's reads to the primary after a write.
+
+    Responses to requests that used a write session set a short-lived cookie,
+    which `get_read_session` honours. Nothing is added without read replicas.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; "
+            f"Max-Age={settings.postgres.read_your_writes_seconds}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not REPLICAS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and scope.get("state", {}).get(
+                _WROTE_TO_PRIMARY
+            ):
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", self.cookie),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+async def get_driver_connection(session: AsyncSession) -> asyncpg.Connection:
+    """Get the asyncpg connection underneath a session.
+
+    The driver connection joins the session's transaction only once the
+    session has executed a statement; before that, statements sent to it run
+    on their own. Writes that must commit or roll back with the session need a
+    statement executed first, but a single read, as in `fast_path`, does not.
+
+    Args:
+        session (AsyncSession): An asynchronous database session.
+
+    Returns:
+        asyncpg.Connection: The raw asyncpg connection.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
@@ -0,0 +1,95 @@
+"""Raw asyncpg fast path for hot single-row lookups.
+
+These lookups skip SQLAlchemy statement compilation, ORM hydration and
+response-model validation: the SQL is rendered once per table, fieldset and
+lookup column and kept in a bounded cache, asyncpg prepares and caches it per
+connection, and the row is encoded straight to JSON bytes. The connection comes
+from the session, so the engine's pool is shared.
+"""
+
+import time
+from functools import lru_cache
+from typing import Any, List, Tuple, Type
+
+import sqlalchemy
+from fastapi.responses import Response
+from sqlalchemy import literal_column, not_
+from sqlalchemy.dialects import postgresql
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.database import get_driver_connection
+from fishsense_api.instrumentation import record_query
+from fishsense_api.responses import dumps
+
+
+@lru_cache(maxsize=256)
+def _statement(
+    model: Type[SQLModel],
+    fields: Tuple[str, ...],
+    column: str,
+    flags: Tuple[Tuple[str, bool], ...],
+) -> str:
+    table = model.__table__
+    query = (
+        sqlalchemy.select(*(table.c[name] for name in fields))
+        .where(table.c[column] == literal_column("$1"))
+        .where(
+            *(table.c[name] if value else not_(table.c[name]) for name, value in flags)
+        )
+        .limit(1)
+    )
+    return str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+async def fetch_one_json(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    fields: List[str] | None,
+    column: str,
+    value: Any,
+    **flags: bool,
+) -> bytes | None:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Look up one row by a column value and encode it as JSON.
+
+    Args:
+        session (AsyncSession): The database session.
+        model (Type[SQLModel]): The table model to read from.
+        fields (List[str] | None): The requested fields, or None for all.
+        column (str): The lookup column.
+        value (Any): The value to match.
+        **flags (bool): Boolean columns the row must have set or cleared.
+
+    Returns:
+        bytes | None: The row as a JSON object, or None if nothing matched.
+    """
+    # Column order, so each fieldset compiles once however the client orders it.
+    requested = set(fields) if fields is not None else None
+    names = tuple(
+        name for name in model.model_fields if requested is None or name in requested
+    )
+    statement = _statement(model, names, column, tuple(sorted(flags.items())))
+    connection = await get_driver_connection(session)
+
+    start = time.perf_counter()
+    row = await connection.fetchrow(statement, value)
+    record_query(statement, time.perf_counter() - start)
+
+    return dumps(dict(row)) if row is not None else None
+
+
+def json_response(body: bytes) -> Response:
+    """Wrap JSON bytes from `fetch_one_json` in a response.
+
+    Args:
+        body (bytes): The encoded JSON.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,162 @@
+"""Bulk image registration through Postgres COPY."""
+
+import logging
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException, Request
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    literal,
+    literal_column,
+    not_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.database import get_driver_connection
+from fishsense_api.models.image import BulkImage, BulkImageResult, Image
+from fishsense_api.streaming import NDJSON_MEDIA_TYPE
+
+logger = logging.getLogger(__name__)
+
+IMAGE_STAGING = Table(
+    "image_staging",
+    MetaData(),
+    Column("path", String(255)),
+    Column("checksum", String(32)),
+    Column("taken_datetime", DateTime(timezone=True)),
+    Column("camera_id", Integer),
+    Column("is_canonical", Boolean),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+STAGED_COLUMNS = [column.name for column in IMAGE_STAGING.columns]
+
+_BULK_IMAGES = TypeAdapter(List[BulkImage])
+
+
+def _record(image: BulkImage) -> Tuple:
+    return tuple(getattr(image, name) for name in STAGED_COLUMNS)
+
+
+def _parse_line(line: bytes, line_number: int) -> Tuple:
+    try:
+        return _record(BulkImage.model_validate_json(line))
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422, detail=f"Invalid image on line {line_number}: {exc}"
+        ) from exc
+
+
+async def read_bulk_images(request: Request) -> AsyncIterator[Tuple]:
+    """Parse a bulk image body into COPY records.
+
+    NDJSON bodies (`Content-Type: application/x-ndjson`) are parsed line by
+    line as they arrive; anything else is parsed as a JSON array.
+
+    Args:
+        request (Request): The incoming request.
+
+    Raises:
+        HTTPException: If an image fails validation.
+
+    Yields:
+        Tuple: One record per image, in `STAGED_COLUMNS` order.
+    """
+    if NDJSON_MEDIA_TYPE not in request.headers.get("content-type", ""):
+        try:
+            images = _BULK_IMAGES.validate_json(await request.body())
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=422, detail=f"Invalid images: {exc}"
+            ) from exc
+        for image in images:
+            yield _record(image)
+        return
+
+    line_number = 0
+    buffer = b""
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_line(line, line_number)
+    if buffer.strip():
+        yield _parse_line(buffer, line_number + 1)
+
+
+async def copy_images(
+    session: AsyncSession, dive_id: int, records: AsyncIterator[Tuple]
+) -> BulkImageResult:
+    """Load images into a temporary staging table with COPY and merge them.
+
+    The staging table is dropped when the transaction commits. Images whose
+    path is already registered are updated in place; if a path appears more
+    than once in `records`, one of its copies is kept.
+
+    Args:
+        session (AsyncSession): The database session.
+        dive_id (int): The dive the images belong to.
+        records (AsyncIterator[Tuple]): Records from `read_bulk_images`.
+
+    Raises:
+        HTTPException: If the images violate a constraint, e.g. an unknown camera.
+
+    Returns:
+        BulkImageResult: How many images were inserted and updated.
+    """
+    connection = await session.connection()
+    await connection.run_sync(IMAGE_STAGING.create)
+
+    driver_connection = await get_driver_connection(session)
+    await driver_connection.copy_records_to_table(
+        IMAGE_STAGING.name, records=records, columns=STAGED_COLUMNS
+    )
+
+    staged = (
+        select(literal(dive_id), *IMAGE_STAGING.columns)
+        .distinct(IMAGE_STAGING.c.path)
+        .order_by(IMAGE_STAGING.c.path)
+    )
+    statement = insert(Image).from_select(["dive_id", *STAGED_COLUMNS], staged)
+    merged = (
+        statement.on_conflict_do_update(
+            index_elements=[Image.path],
+            set_={
+                name: statement.excluded[name]
+                for name in ["dive_id", *STAGED_COLUMNS]
+                if name != "path"
+            },
+        )
+        .returning(literal_column("xmax = 0").label("inserted"))
+        .cte("merged")
+    )
+
+    try:
+        inserted, updated = (
+            await session.exec(
+                select(
+                    func.count().filter(merged.c.inserted),
+                    func.count().filter(not_(merged.c.inserted)),
+                )
+            )
+        ).one()
+    except IntegrityError as exc:
+        logger.warning(
+            "Bulk images for dive with id=%d rejected: %s", dive_id, exc.orig
+        )
+        raise HTTPException(
+            status_code=422, detail=f"Invalid images: {exc.orig}"
+        ) from exc
+    return BulkImageResult(inserted=inserted, updated=updated)
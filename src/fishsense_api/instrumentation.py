@@ -0,0 +1,201 @@
+"""Per-request HTTP and database instrumentation for FishSense API."""
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fishsense_api.config import settings
+from fishsense_api.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING = settings.profiling.server_timing
+SLOW_QUERY_MS = settings.profiling.slow_query_ms
+UNMATCHED_ROUTE = "unmatched"
+_START_TIME = "fishsense_start_time"
+
+REQUESTS = Counter(
+    "fishsense_http_requests_total",
+    "HTTP requests handled, by route and status.",
+    ("method", "route", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "fishsense_http_request_duration_seconds",
+    "Time to handle an HTTP request, including streaming the response.",
+    ("method", "route"),
+)
+RESPONSE_BYTES = Histogram(
+    "fishsense_http_response_size_bytes",
+    "Size of HTTP response bodies.",
+    ("method", "route"),
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+REQUEST_QUERIES = Histogram(
+    "fishsense_http_request_db_queries",
+    "Database statements executed while handling an HTTP request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "fishsense_http_request_db_duration_seconds",
+    "Time spent executing database statements while handling an HTTP request.",
+    ("method", "route"),
+)
+
+
+@dataclass
+class RequestStats:
+    """Database work attributed to the current request."""
+
+    method: str = ""
+    path: str = ""
+    queries: int = 0
+    db_seconds: float = 0.0
+
+    def server_timing(self) -> bytes:
+        """Format the database work so far as a `Server-Timing` header value.
+
+        Returns:
+            bytes: The header value.
+        """
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"'
+        ).encode()
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals so similar statements group together.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The normalized statement.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+_CURRENT_REQUEST: ContextVar[RequestStats | None] = ContextVar(
+    "fishsense_current_request", default=None
+)
+
+
+def _before_cursor_execute(
+    _conn, _cursor, _statement, _parameters, context, _executemany
+) -> None:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    setattr(context, _START_TIME, time.perf_counter())
+
+
+def record_query(statement: str, elapsed: float) -> None:
+    """Attribute one executed statement to the current request.
+
+    Called for every statement run through an instrumented engine, and by
+    code that talks to the driver directly.
+
+    Args:
+        statement (str): The SQL statement.
+        elapsed (float): How long the statement took, in seconds.
+    """
+    stats = _CURRENT_REQUEST.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        sql = normalize_sql(statement)
+        duration_ms = round(elapsed * 1000, 1)
+        request = f"{stats.method} {stats.path}" if stats is not None else None
+        logger.warning(
+            "Slow query (%.1f ms) during %s: %s",
+            duration_ms,
+            request,
+            sql,
+            extra={"sql": sql, "duration_ms": duration_ms, "request": request},
+        )
+
+
+def _after_cursor_execute(
+    _conn, _cursor, statement, _parameters, context, _executemany
+) -> None:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    record_query(statement, time.perf_counter() - getattr(context, _START_TIME))
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attribute every statement an engine executes to the current request.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    # pylint: disable=too-few-public-methods
+    """ASGI middleware recording request counts, latency, size and DB work per route.
+
+    Routes are labelled by their path template, e.g. `/api/v1/images/{image_id}`,
+    so label cardinality stays bounded. With `profiling.server_timing` on, the
+    database work done before the response starts is also reported in a
+    `Server-Timing` header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(method=scope["method"], path=scope["path"])
+        token = _CURRENT_REQUEST.set(stats)
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", stats.server_timing()),
+                    ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            _CURRENT_REQUEST.reset(token)
+
+            labels = {"method": scope["method"], "route": _route(scope)}
+            REQUESTS.inc(status=str(status), **labels)
+            REQUEST_SECONDS.observe(elapsed, **labels)
+            RESPONSE_BYTES.observe(size, **labels)
+            REQUEST_QUERIES.observe(stats.queries, **labels)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, **labels)
@@ -0,0 +1,11 @@
+"""Model representing the outcome of one item in a bulk upsert."""
+
+from pydantic import BaseModel
+
+
+class BulkUpsertResult(BaseModel):
+    """Pydantic model for the outcome of one item in a bulk upsert."""
+
+    index: int
+    id: int | None = None
+    error: str | None = None
@@ -16,4 +16,4 @@ class CameraIntrinsics(SQLModel, table=True):
         default_factory=list, sa_column=Column(JSON)
     )
 
-    camera_id: int = Field(default=None, foreign_key="camera.id")
+    camera_id: int = Field(default=None, foreign_key="camera.id", index=True)
@@ -17,7 +17,7 @@ class DiveFrameCluster(ModelBase, table=True):
     data_source: DataSource = Field(sa_column=Column(Enum(DataSource)))
     updated_at: datetime | None = Field(sa_type=DateTime(timezone=True), default=None)
 
-    dive_id: int | None = Field(default=None, foreign_key="dive.id")
+    dive_id: int | None = Field(default=None, foreign_key="dive.id", index=True)
     fish_id: int | None = Field(default=None, foreign_key="fish.id")
 
 
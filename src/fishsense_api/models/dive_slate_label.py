@@ -35,7 +35,7 @@ class DiveSlateLabel(ModelBase, table=True):
     updated_at: datetime | None = Field(sa_type=DateTime(timezone=True), default=None)
     completed: bool | None = Field(default=False)
     label_studio_json: Dict[str, Any] | None = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON, info={"deferred": True})
     )
 
     image_id: int | None = Field(default=None, foreign_key="image.id")
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict
 
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint, text
 from sqlmodel import JSON, Column, DateTime, Field
 
 from fishsense_api.models.model_base import ModelBase
@@ -21,6 +21,11 @@ class HeadTailLabel(ModelBase, table=True):
             "label_studio_project_id",
             name="uq_headtail_image_project",
         ),
+        Index(
+            "ix_headtaillabel_image_id_not_superseded",
+            "image_id",
+            postgresql_where=text("NOT superseded"),
+        ),
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -34,7 +39,7 @@ class HeadTailLabel(ModelBase, table=True):
     superseded: bool | None = Field(default=False)
     completed: bool | None = Field(default=False)
     label_studio_json: Dict[str, Any] | None = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON, info={"deferred": True})
     )
 
     image_id: int | None = Field(default=None, foreign_key="image.id")
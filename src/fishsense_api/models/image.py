@@ -1,8 +1,10 @@
 """Model representing an image."""
 
 from datetime import datetime
+from typing import Dict, List
 
-from sqlmodel import DateTime, Field
+from pydantic import BaseModel
+from sqlmodel import DateTime, Field, Index, text
 
 from fishsense_api.models.model_base import ModelBase
 
@@ -10,11 +12,49 @@ from fishsense_api.models.model_base import ModelBase
 class Image(ModelBase, table=True):
     """Model representing an image."""
 
+    __table_args__ = (
+        Index(
+            "ix_image_dive_id_canonical",
+            "dive_id",
+            postgresql_where=text("is_canonical"),
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     path: str = Field(max_length=255, unique=True, index=True)
     taken_datetime: datetime = Field(sa_type=DateTime(timezone=True), default=None)
     checksum: str = Field(max_length=32, index=True)
     is_canonical: bool = Field(default=False)
 
-    dive_id: int | None = Field(default=None, foreign_key="dive.id")
+    dive_id: int | None = Field(default=None, foreign_key="dive.id", index=True)
     camera_id: int | None = Field(default=None, foreign_key="camera.id")
+
+
+class BulkImage(BaseModel):
+    """Pydantic model for one image in a bulk registration."""
+
+    path: str = Field(max_length=255)
+    checksum: str = Field(max_length=32)
+    taken_datetime: datetime
+    camera_id: int | None = None
+    is_canonical: bool = False
+
+
+class BulkImageResult(BaseModel):
+    """Pydantic model summarizing a bulk image registration."""
+
+    inserted: int
+    updated: int
+
+
+class ChecksumLookup(BaseModel):
+    """Pydantic model for a batch checksum lookup request."""
+
+    checksums: List[str]
+
+
+class ChecksumLookupResult(BaseModel):
+    """Pydantic model for the result of a batch checksum lookup."""
+
+    found: Dict[str, List[int]]
+    missing: List[str]
@@ -3,7 +3,8 @@
 from datetime import datetime
 from typing import List
 
-from sqlmodel import JSON, Column, DateTime, Field
+from pydantic import BaseModel
+from sqlmodel import JSON, Column, DateTime, Field, Index, text
 
 from fishsense_api.models.model_base import ModelBase
 
@@ -11,6 +12,14 @@ from fishsense_api.models.model_base import ModelBase
 class LaserExtrinsics(ModelBase, table=True):
     """Laser extrinsics model representing laser calibration data in the database."""
 
+    __table_args__ = (
+        Index(
+            "ix_laserextrinsics_dive_id_created_at",
+            "dive_id",
+            text("created_at DESC NULLS LAST"),
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     laser_position: List[float] = Field(default_factory=list, sa_column=Column(JSON))
     laser_axis: List[float] = Field(default_factory=list, sa_column=Column(JSON))
@@ -18,3 +27,9 @@ class LaserExtrinsics(ModelBase, table=True):
 
     dive_id: int | None = Field(default=None, foreign_key="dive.id")
     camera_id: int = Field(default=None, foreign_key="camera.id")
+
+
+class LaserExtrinsicsLookup(BaseModel):
+    """Pydantic model for a batch latest laser extrinsics request."""
+
+    dive_ids: List[int]
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict
 
-from sqlmodel import JSON, Column, DateTime, Field, UniqueConstraint
+from sqlmodel import JSON, Column, DateTime, Field, Index, UniqueConstraint, text
 
 from fishsense_api.models.model_base import ModelBase
 
@@ -20,6 +20,11 @@ class LaserLabel(ModelBase, table=True):
             "label_studio_project_id",
             name="uq_laser_image_project",
         ),
+        Index(
+            "ix_laserlabel_image_id_not_superseded",
+            "image_id",
+            postgresql_where=text("NOT superseded"),
+        ),
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -32,7 +37,7 @@ class LaserLabel(ModelBase, table=True):
     superseded: bool | None = Field(default=False)
     completed: bool | None = Field(default=False)
     label_studio_json: Dict[str, Any] | None = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON, info={"deferred": True})
     )
 
     image_id: int | None = Field(default=None, foreign_key="image.id")
@@ -10,4 +10,4 @@ class Measurement(SQLModel, table=True):
     length_m: float | None = Field(default=None)
 
     image_id: int | None = Field(default=None, foreign_key="image.id")
-    fish_id: int | None = Field(default=None, foreign_key="fish.id")
+    fish_id: int | None = Field(default=None, foreign_key="fish.id", index=True)
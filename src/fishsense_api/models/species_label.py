@@ -37,7 +37,7 @@ class SpeciesLabel(ModelBase, table=True):
     fish_angle_category: str | None = Field(default=None)
     fish_curved_category: str | None = Field(default=None)
     label_studio_json: Dict[str, Any] | None = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON, info={"deferred": True})
     )
 
     image_id: int | None = Field(default=None, foreign_key="image.id")
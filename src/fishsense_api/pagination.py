@@ -0,0 +1,120 @@
+"""Keyset pagination helpers for FishSense API list endpoints."""
+
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Any, Generic, List, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.projection import PRIMARY_KEY, fetch_all
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class Page(BaseModel, Generic[T]):
+    """A single page of results from a paginated list endpoint."""
+
+    items: List[T]
+    next: str | None = None
+
+
+@dataclass
+class PageParams:
+    """Pagination parameters parsed from the query string."""
+
+    limit: int
+    after: int | None
+    unpaginated: bool
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last id of a page as an opaque cursor.
+
+    Args:
+        last_id (int): The id of the last row on the page.
+
+    Returns:
+        str: The opaque cursor to pass as `after` for the next page.
+    """
+    return base64.urlsafe_b64encode(str(last_id).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode an opaque cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        int: The id of the last row on the previous page.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + padding).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def page_params(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(
+        default=None, description="Cursor returned as `next` by the previous page."
+    ),
+    unpaginated: bool = Query(
+        default=False, description="Return every row as a plain list."
+    ),
+) -> PageParams:
+    """Dependency parsing the pagination query parameters."""
+    return PageParams(
+        limit=limit,
+        after=decode_cursor(after) if after is not None else None,
+        unpaginated=unpaginated,
+    )
+
+
+async def paginate(
+    session: AsyncSession,
+    query,
+    id_column: Any,
+    params: PageParams,
+    fields: List[str] | None = None,
+) -> Page[T] | List[T]:
+    """Run a list query one keyset page at a time.
+
+    Rows are always ordered by `id_column`, so pages are stable while rows are
+    being inserted.
+
+    Args:
+        session (AsyncSession): The database session.
+        query: The unordered, unlimited list query.
+        id_column (Any): The unique, monotonically increasing key column.
+        params (PageParams): The parsed pagination parameters.
+        fields (List[str] | None): The fieldset the query was built with.
+
+    Returns:
+        Page[T] | List[T]: The requested page, or every row when the caller
+            explicitly opted out of pagination.
+    """
+    query = query.order_by(id_column)
+    if params.unpaginated:
+        return await fetch_all(session, query, fields)
+
+    if params.after is not None:
+        query = query.where(id_column > params.after)
+
+    rows = await fetch_all(session, query.limit(params.limit + 1), fields)
+    if len(rows) <= params.limit:
+        return Page(items=rows)
+
+    rows = rows[: params.limit]
+    last_id = rows[-1][PRIMARY_KEY] if fields is not None else rows[-1].id
+    return Page(items=rows, next=encode_cursor(last_id))
@@ -0,0 +1,153 @@
+"""Sparse fieldset (`?fields=`) helpers for FishSense API read endpoints."""
+
+from typing import Any, List, Type
+
+import sqlalchemy
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.config import settings
+from fishsense_api.responses import FastJSONResponse
+
+PRIMARY_KEY = "id"
+
+
+class FieldSelector:
+    # pylint: disable=too-few-public-methods
+    """Dependency parsing the `fields` query parameter for a model.
+
+    The primary key is always part of the returned fieldset so that rows stay
+    addressable and pageable.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+
+    def __call__(
+        self,
+        fields: str | None = Query(
+            default=None, description="Comma-separated list of fields to return."
+        ),
+    ) -> List[str] | None:
+        if fields is None:
+            return None
+
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.model.model_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+
+        if PRIMARY_KEY in self.model.model_fields:
+            names.insert(0, PRIMARY_KEY)
+        return list(dict.fromkeys(names))
+
+
+class DeferredFieldSelector(FieldSelector):
+    # pylint: disable=too-few-public-methods
+    """Dependency parsing `fields` and `include_raw` for a model with deferred columns.
+
+    Columns marked with `info={"deferred": True}` are left out of the fieldset
+    unless they are named in `fields` or `include_raw=true` is passed.
+    """
+
+    def __call__(
+        self,
+        fields: str | None = Query(
+            default=None, description="Comma-separated list of fields to return."
+        ),
+        include_raw: bool = Query(
+            default=False, description="Also return raw, deferred-by-default fields."
+        ),
+    ) -> List[str] | None:
+        selected = super().__call__(fields)
+        deferred = [
+            column.name
+            for column in self.model.__table__.columns
+            if column.info.get("deferred")
+        ]
+
+        if include_raw:
+            return (
+                None if selected is None else list(dict.fromkeys(selected + deferred))
+            )
+        if selected is None:
+            return [name for name in self.model.model_fields if name not in deferred]
+        return selected
+
+
+def select_fields(model: Type[SQLModel], fields: List[str] | None):
+    """Build a select for a table model, restricted to the requested columns.
+
+    Args:
+        model (Type[SQLModel]): The table model to select from.
+        fields (List[str] | None): The requested fields, or None for whole rows.
+
+    Returns:
+        The select statement. Whole rows yield model instances, projected rows
+        yield `Row` objects.
+    """
+    if fields is None:
+        return select(model)
+    return sqlalchemy.select(*(model.__table__.c[name] for name in fields))
+
+
+async def fetch_all(
+    session: AsyncSession, query, fields: List[str] | None
+) -> List[Any]:
+    """Run a query built by `select_fields` and return every row.
+
+    Args:
+        session (AsyncSession): The database session.
+        query: The query to run.
+        fields (List[str] | None): The fieldset the query was built with.
+
+    Returns:
+        List[Any]: Model instances, or one dict per row for projected queries.
+    """
+    result = await session.exec(query)
+    if fields is None:
+        return result.all()
+    return [dict(row) for row in result.mappings()]
+
+
+async def fetch_first(session: AsyncSession, query, fields: List[str] | None) -> Any:
+    """Run a query built by `select_fields` and return the first row.
+
+    Args:
+        session (AsyncSession): The database session.
+        query: The query to run.
+        fields (List[str] | None): The fieldset the query was built with.
+
+    Returns:
+        Any: A model instance, a dict for projected queries, or None.
+    """
+    result = await session.exec(query)
+    if fields is None:
+        return result.first()
+    row = result.mappings().first()
+    return dict(row) if row is not None else None
+
+
+def respond(content: Any, fields: List[str] | None) -> Any:
+    """Encode handler results straight to JSON, skipping response-model validation.
+
+    Partial rows do not satisfy the declared response model, so they are
+    always encoded directly. Whole rows are returned untouched for FastAPI to
+    validate, unless the `api.fast_json` setting is on. Ready-made responses
+    are always returned untouched.
+
+    Args:
+        content (Any): The handler result.
+        fields (List[str] | None): The requested fieldset.
+
+    Returns:
+        Any: The content itself, or a `FastJSONResponse` encoding it.
+    """
+    if isinstance(content, Response) or (fields is None and not settings.api.fast_json):
+        return content
+    return FastJSONResponse(content)
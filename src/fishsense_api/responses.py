@@ -0,0 +1,29 @@
+"""Fast JSON encoding for FishSense API responses."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact JSON in a single pass.
+
+    Model instances, dicts of column values and lists of either are encoded
+    directly by pydantic-core, without building intermediate dicts. NaN and
+    infinity are encoded as null so the output is always valid JSON.
+
+    Args:
+        content (Any): The content to encode.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    return to_json(content, inf_nan_mode="null")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of the `json` module."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,11 +1,17 @@
 """FishSense API Server"""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from fishsense_api.__version__ import __version__
-from fishsense_api.database import DATABASE
+from fishsense_api.cache import listen_for_invalidations
+from fishsense_api.database import DATABASE, REPLICAS, ReadYourWritesMiddleware
+from fishsense_api.instrumentation import MetricsMiddleware
+from fishsense_api.metrics import CONTENT_TYPE, render
+from fishsense_api.responses import FastJSONResponse
 
 
 @asynccontextmanager
@@ -21,13 +27,26 @@ async def lifespan(_: FastAPI):
     async with database.engine.begin() as conn:
         await database.init_database(conn)
 
+    listener = asyncio.create_task(listen_for_invalidations(database.engine.url))
+
     yield
 
     # Shutdown events (e.g., dispose engine)
+    listener.cancel()
+    # Returning exceptions keeps a failed listener from skipping disposal.
+    await asyncio.gather(listener, return_exceptions=True)
     await database.dispose()
+    for replica in REPLICAS:
+        await replica.dispose()
 
 
-app = FastAPI(lifespan=lifespan, version=__version__)
+app = FastAPI(
+    lifespan=lifespan,
+    version=__version__,
+    default_response_class=FastJSONResponse,
+)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -39,3 +58,14 @@ def home():
         "docs": "/docs",
         "version": __version__,
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Runtime metrics in the Prometheus text exposition format.
+
+    Rendered on the event loop, where `MetricsMiddleware` records, so a scrape
+    never iterates a metric while a request adds a new label set to it.
+    """
+
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,68 @@
+"""NDJSON streaming helpers for large FishSense API listings."""
+
+from collections.abc import Mapping
+from typing import Any, AsyncIterator, List
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.responses import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Check whether the client asked for an NDJSON response.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        bool: True if the `Accept` header includes `application/x-ndjson`.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _encode(rows: List[Any]) -> bytes:
+    return b"".join(
+        dumps(dict(row) if isinstance(row, Mapping) else row) + b"\n" for row in rows
+    )
+
+
+async def stream_ndjson(
+    session: AsyncSession, query, fields: List[str] | None = None
+) -> StreamingResponse | None:
+    """Stream the rows of a query as NDJSON from a server-side cursor.
+
+    Rows are fetched `STREAM_BATCH_SIZE` at a time, so memory stays flat no
+    matter how many rows match. The first batch is fetched before returning
+    so callers can still answer 404 for an empty result.
+
+    Args:
+        session (AsyncSession): The database session.
+        query: The query to stream.
+        fields (List[str] | None): The fieldset the query was built with.
+
+    Returns:
+        StreamingResponse | None: The streaming response, or None if the query
+            returned no rows.
+    """
+    query = query.execution_options(yield_per=STREAM_BATCH_SIZE)
+    if fields is None:
+        result = await session.stream_scalars(query)
+    else:
+        result = (await session.stream(query)).mappings()
+    partitions = result.partitions()
+    first = await anext(partitions, None)
+    if first is None:
+        await result.close()
+        return None
+
+    async def _body() -> AsyncIterator[bytes]:
+        yield _encode(first)
+        async for partition in partitions:
+            yield _encode(partition)
+
+    return StreamingResponse(_body(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,201 @@
+"""Native Postgres upserts for FishSense API write endpoints."""
+
+import logging
+from typing import Any, Dict, List, Type
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fishsense_api.models.bulk_upsert_result import BulkUpsertResult
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_KEY = "id"
+# asyncpg accepts at most 32767 bind parameters per statement.
+MAX_BIND_PARAMETERS = 32767
+
+
+def constraint_columns(model: Type[SQLModel], constraint: str) -> List[str]:
+    """Look up the columns of a named unique constraint.
+
+    Args:
+        model (Type[SQLModel]): The table model.
+        constraint (str): The constraint name, e.g. `uq_headtail_image_project`.
+
+    Raises:
+        ValueError: If the table has no constraint with that name.
+
+    Returns:
+        List[str]: The constraint's column names.
+    """
+    for table_constraint in model.__table__.constraints:
+        if table_constraint.name == constraint:
+            return [column.name for column in table_constraint.columns]
+    raise ValueError(f"{model.__tablename__} has no constraint {constraint}")
+
+
+def upsert_statement(
+    model: Type[SQLModel],
+    values: Dict[str, Any] | List[Dict[str, Any]],
+    constraint: str | None = None,
+):
+    """Build an `INSERT ... ON CONFLICT DO UPDATE ... RETURNING id` statement.
+
+    Conflicts are resolved on the natural unique `constraint` when all of its
+    columns are set, otherwise on the primary key when the row carries one.
+    Rows with neither are plain inserts. Multi-row statements must use the
+    same key columns for every row.
+
+    Args:
+        model (Type[SQLModel]): The table model to write to.
+        values (Dict[str, Any] | List[Dict[str, Any]]): One or more rows.
+        constraint (str | None): The natural unique constraint name.
+
+    Returns:
+        The upsert statement.
+    """
+    table = model.__table__
+    rows = [values] if isinstance(values, dict) else values
+    rows = [
+        {
+            name: value
+            for name, value in row.items()
+            if name in table.c and (name != PRIMARY_KEY or value is not None)
+        }
+        for row in rows
+    ]
+
+    statement = insert(table).values(rows).returning(*table.primary_key.columns)
+    first = rows[0]
+
+    if constraint is not None and all(
+        first.get(name) is not None for name in constraint_columns(model, constraint)
+    ):
+        conflict = {"constraint": constraint}
+        keys = constraint_columns(model, constraint)
+    elif PRIMARY_KEY in first:
+        conflict = {"index_elements": [PRIMARY_KEY]}
+        keys = [PRIMARY_KEY]
+    else:
+        return statement
+
+    # Always set at least one column so RETURNING yields the existing row.
+    update = {
+        name: statement.excluded[name]
+        for name in first
+        if name != PRIMARY_KEY and name not in keys
+    } or {keys[0]: statement.excluded[keys[0]]}
+    return statement.on_conflict_do_update(**conflict, set_=update)
+
+
+async def upsert(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    values: Dict[str, Any],
+    constraint: str | None = None,
+) -> int:
+    """Insert or update a single row in one round trip.
+
+    Args:
+        session (AsyncSession): The database session.
+        model (Type[SQLModel]): The table model to write to.
+        values (Dict[str, Any]): The row's column values.
+        constraint (str | None): The natural unique constraint name.
+
+    Returns:
+        int: The id of the inserted or updated row.
+    """
+    statement = upsert_statement(model, values, constraint)
+    return (await session.exec(statement)).scalar_one()
+
+
+async def bulk_upsert(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    rows: List[Dict[str, Any]],
+    constraint: str,
+) -> List[BulkUpsertResult]:
+    """Insert or update many rows with batched multi-row upserts.
+
+    Rows are matched on the natural unique `constraint` only; ids in `rows` are
+    ignored. Rows missing a key column, or repeating the key of a later row,
+    are reported as errors and skipped. If a batch violates another
+    constraint, it is retried row by row inside savepoints so that only the
+    offending rows fail.
+
+    Args:
+        session (AsyncSession): The database session.
+        model (Type[SQLModel]): The table model to write to.
+        rows (List[Dict[str, Any]]): The rows' column values.
+        constraint (str): The natural unique constraint name.
+
+    Returns:
+        List[BulkUpsertResult]: One result per input row, in input order.
+    """
+    table = model.__table__
+    keys = constraint_columns(model, constraint)
+    results = [BulkUpsertResult(index=index) for index in range(len(rows))]
+
+    pending = _index_by_key(rows, keys, results)
+    values = [
+        {name: value for name, value in rows[i].items() if name != PRIMARY_KEY}
+        for i in pending.values()
+    ]
+    batch_size = max(1, MAX_BIND_PARAMETERS // len(table.columns))
+
+    for start in range(0, len(values), batch_size):
+        batch = values[start : start + batch_size]
+        statement = upsert_statement(model, batch, constraint).returning(
+            *(table.c[name] for name in keys)
+        )
+        try:
+            async with session.begin_nested():
+                returned = (await session.exec(statement)).all()
+        except IntegrityError:
+            logger.warning(
+                "Bulk upsert batch into %s failed; retrying row by row",
+                table.name,
+            )
+            await _upsert_rows(session, model, batch, constraint, results, pending)
+            continue
+
+        for row in returned:
+            results[pending[tuple(row[1:])]].id = row[0]
+
+    return results
+
+
+def _index_by_key(
+    rows: List[Dict[str, Any]], keys: List[str], results: List[BulkUpsertResult]
+) -> Dict[tuple, int]:
+    pending: Dict[tuple, int] = {}
+    for index, row in enumerate(rows):
+        key = tuple(row.get(name) for name in keys)
+        if None in key:
+            results[index].error = f"Missing {', '.join(keys)}"
+            continue
+        if key in pending:
+            results[pending[key]].error = f"Superseded by item {index}"
+        pending[key] = index
+    return pending
+
+
+async def _upsert_rows(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    rows: List[Dict[str, Any]],
+    constraint: str,
+    results: List[BulkUpsertResult],
+    pending: Dict[tuple, int],
+) -> None:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    keys = constraint_columns(model, constraint)
+    for row in rows:
+        result = results[pending[tuple(row[name] for name in keys)]]
+        try:
+            async with session.begin_nested():
+                result.id = await upsert(session, model, row, constraint)
+        except IntegrityError as exc:
+            result.error = str(exc.orig)
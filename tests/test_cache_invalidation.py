@@ -0,0 +1,117 @@
+"""Cross-worker cache invalidation tests.
+
+Runs `listen_for_invalidations` against a real Postgres and writes through
+`invalidate_on_commit` on another connection, with this process's own
+after-commit hook removed so the write looks like it came from another worker.
+Only the NOTIFY can then clear the cache.
+
+The tests are skipped unless FISHSENSE_TEST_DATABASE_URL points at a
+disposable database; see tests/conftest.py.
+"""
+
+# pylint: disable=wrong-import-position,redefined-outer-name
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Type
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+if not os.environ.get("FISHSENSE_TEST_DATABASE_URL"):
+    pytest.skip("FISHSENSE_TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from fishsense_api.cache import (
+    CACHES,
+    _clear_written_tables,
+    invalidate_on_commit,
+    listen_for_invalidations,
+    table_cache,
+)
+from fishsense_api.database import DATABASE
+from fishsense_api.models.camera import Camera
+from fishsense_api.models.user import User
+
+TIMEOUT = 5
+
+
+@pytest.fixture(autouse=True)
+def another_worker():
+    """Leave clearing this process's caches to the listener alone."""
+    event.remove(Session, "after_commit", _clear_written_tables)
+    yield
+    event.listen(Session, "after_commit", _clear_written_tables)
+
+
+async def _eventually(condition: Callable[[], bool]) -> bool:
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+@asynccontextmanager
+async def _listening():
+    async with DATABASE.engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    # The listener clears every cache once it is subscribed.
+    users = table_cache(User)
+    table_cache(Camera)
+    users.set("subscribed", True)
+    listener = asyncio.create_task(listen_for_invalidations(DATABASE.engine.url))
+    try:
+        assert await _eventually(lambda: not users), "listener did not subscribe"
+        yield
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await DATABASE.dispose()
+
+
+async def _write(model: Type[SQLModel], row: SQLModel, commit: bool) -> None:
+    async with AsyncSession(DATABASE.engine) as session:
+        session.add(row)
+        await session.flush()
+        await invalidate_on_commit(session, model)
+        if commit:
+            await session.commit()
+        else:
+            await session.rollback()
+
+
+def test_committed_write_clears_cache():
+    """A committed write to a cached table clears it through the listener."""
+
+    async def scenario():
+        async with _listening():
+            CACHES["user"].set(1, "cached")
+            await _write(User, User(label_studio_id=1, email="a@example.com"), True)
+            assert await _eventually(lambda: not CACHES["user"])
+
+    asyncio.run(scenario())
+
+
+def test_rolled_back_write_keeps_cache():
+    """A rolled-back write sends no notification, so the cache survives it."""
+
+    async def scenario():
+        async with _listening():
+            CACHES["user"].set(1, "cached")
+            CACHES["camera"].set(1, "cached")
+            await _write(User, User(label_studio_id=1, email="a@example.com"), False)
+            # Notifications arrive in commit order, so once this one has been
+            # handled a notification from the rolled-back write would have been.
+            await _write(Camera, Camera(serial_number="serial-1", name="cam"), True)
+            assert await _eventually(lambda: not CACHES["camera"])
+            assert CACHES["user"].get(1) == "cached"
+
+    asyncio.run(scenario())
@@ -0,0 +1,230 @@
+"""Query-plan regression tests for the hot read paths.
+
+Each test calls an endpoint against a seeded Postgres, captures every query it
+runs and fails if `EXPLAIN` still plans a sequential scan with
+`enable_seqscan` off, which means no index can serve the query.
+
+The tests are skipped unless FISHSENSE_TEST_DATABASE_URL points at a
+disposable database; see tests/conftest.py.
+"""
+
+# pylint: disable=wrong-import-position,redefined-outer-name
+
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+if not os.environ.get("FISHSENSE_TEST_DATABASE_URL"):
+    pytest.skip("FISHSENSE_TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from fishsense_api import app
+from fishsense_api.cache import CACHES
+from fishsense_api.database import DATABASE, READ_PRIMARY_COOKIE
+from fishsense_api.models.camera import Camera
+from fishsense_api.models.camera_intrinsics import CameraIntrinsics
+from fishsense_api.models.data_source import DataSource
+from fishsense_api.models.dive import Dive
+from fishsense_api.models.dive_frame_cluster import (
+    DiveFrameCluster,
+    DiveFrameClusterImageMapping,
+)
+from fishsense_api.models.dive_slate_label import DiveSlateLabel
+from fishsense_api.models.fish import Fish
+from fishsense_api.models.head_tail_label import HeadTailLabel
+from fishsense_api.models.image import Image
+from fishsense_api.models.laser_extrinsics import LaserExtrinsics
+from fishsense_api.models.laser_label import LaserLabel
+from fishsense_api.models.measurement import Measurement
+from fishsense_api.models.species import Species
+from fishsense_api.models.species_label import SpeciesLabel
+from fishsense_api.models.user import User
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+IMAGE_COUNT = 10
+
+HOT_PATHS: List[Tuple[str, str, Dict[str, Any] | None]] = [
+    ("GET", "/api/v1/images/1", None),
+    ("GET", "/api/v1/images/checksum/checksum-1", None),
+    ("POST", "/api/v1/images/checksums:lookup", {"checksums": ["checksum-1", "x"]}),
+    ("GET", "/api/v1/dives/1", None),
+    ("GET", "/api/v1/dives/1/images/", None),
+    ("GET", "/api/v1/dives/1/images/clusters/PREDICTION", None),
+    ("GET", "/api/v1/canonical/dives/", None),
+    ("GET", "/api/v1/dives/1/laser-extrinsics/", None),
+    ("POST", "/api/v1/dives/laser-extrinsics:latest", {"dive_ids": [1]}),
+    ("GET", "/api/v1/dives/1/labels/headtail", None),
+    ("GET", "/api/v1/dives/1/labels/laser", None),
+    ("GET", "/api/v1/dives/1/labels/species", None),
+    ("GET", "/api/v1/dives/1/labels/dive-slate", None),
+    ("GET", "/api/v1/labels/headtail/1", None),
+    ("GET", "/api/v1/labels/laser/1", None),
+    ("GET", "/api/v1/labels/species/1", None),
+    ("GET", "/api/v1/labels/dive-slate/1", None),
+    ("GET", "/api/v1/labels/headtail/label-studio/1", None),
+    ("GET", "/api/v1/labels/laser/label-studio/1", None),
+    ("GET", "/api/v1/cameras/1", None),
+    ("GET", "/api/v1/cameras/1/intrinsics/", None),
+    ("GET", "/api/v1/fish/1", None),
+    ("GET", "/api/v1/fish/species/Thunnus", None),
+    ("GET", "/api/v1/users/1", None),
+    ("GET", "/api/v1/users/label-studio/1", None),
+    ("GET", "/api/v1/users/email/diver@example.com", None),
+]
+
+
+def _seed_rows() -> List[List[SQLModel]]:
+    # Grouped so each group only references rows flushed before it.
+    label = {"label_studio_project_id": 1, "image_id": 1, "user_id": 1}
+    return [
+        [
+            Camera(id=1, serial_number="serial-1", name="camera-1"),
+            Species(id=1, scientific_name="Thunnus"),
+            User(
+                id=1,
+                label_studio_id=1,
+                email="diver@example.com",
+                first_name="Test",
+                last_name="Diver",
+            ),
+        ],
+        [
+            CameraIntrinsics(
+                id=1,
+                camera_id=1,
+                camera_matrix=[[1.0, 0.0], [0.0, 1.0]],
+                distortion_coefficients=[0.0],
+            ),
+            Dive(id=1, path="dive-1", dive_datetime=NOW, camera_id=1),
+            Fish(id=1, species_id=1),
+        ],
+        [
+            *(
+                Image(
+                    id=i,
+                    path=f"image-{i}",
+                    checksum=f"checksum-{i}",
+                    taken_datetime=NOW,
+                    is_canonical=i == 1,
+                    dive_id=1,
+                    camera_id=1,
+                )
+                for i in range(1, IMAGE_COUNT + 1)
+            ),
+            DiveFrameCluster(
+                id=1, data_source=DataSource.PREDICTION, dive_id=1, fish_id=1
+            ),
+            LaserExtrinsics(
+                id=1,
+                laser_position=[0.0, 0.0, 0.0],
+                laser_axis=[0.0, 0.0, 1.0],
+                created_at=NOW,
+                dive_id=1,
+                camera_id=1,
+            ),
+        ],
+        [
+            DiveFrameClusterImageMapping(dive_frame_cluster_id=1, image_id=1),
+            Measurement(id=1, length_m=1.0, image_id=1, fish_id=1),
+            HeadTailLabel(id=1, label_studio_task_id=1, **label),
+            LaserLabel(id=1, label_studio_task_id=1, **label),
+            SpeciesLabel(id=1, label_studio_task_id=1, **label),
+            DiveSlateLabel(id=1, label_studio_task_id=1, **label),
+        ],
+    ]
+
+
+@pytest.fixture(scope="module")
+def client(primary_url, recreate_database):
+    """Recreate and seed the test database, then serve the app against it."""
+    recreate_database(primary_url, *_seed_rows())
+
+    with TestClient(app) as test_client:
+        # Plans are checked on the primary, so reads must not go to replicas.
+        test_client.cookies.set(READ_PRIMARY_COOKIE, "1")
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def statements(client):
+    """Record every statement the app sends, through SQLAlchemy or asyncpg."""
+    # pylint: disable=unused-argument
+    captured: List[Tuple[str, Tuple]] = []
+
+    def before_cursor_execute(
+        _conn, _cursor, statement, parameters, _context, _executemany
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        captured.append((statement, tuple(parameters or ())))
+
+    fetchrow = asyncpg.Connection.fetchrow
+
+    async def recording_fetchrow(self, query, *args, **kwargs):
+        captured.append((query, args))
+        return await fetchrow(self, query, *args, **kwargs)
+
+    event.listen(
+        DATABASE.engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    asyncpg.Connection.fetchrow = recording_fetchrow
+    yield captured
+    asyncpg.Connection.fetchrow = fetchrow
+    event.remove(
+        DATABASE.engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+def _reads_table(statement: str) -> bool:
+    statement = statement.lstrip().upper()
+    return statement.startswith(("SELECT", "WITH")) and " FROM " in statement
+
+
+async def _explain(statement: str, parameters: Tuple) -> Dict[str, Any]:
+    connection = await asyncpg.connect(
+        DATABASE.engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+    )
+    try:
+        await connection.execute("SET enable_seqscan = off")
+        plan = await connection.fetchval(
+            f"EXPLAIN (FORMAT JSON) {statement}", *parameters
+        )
+    finally:
+        await connection.close()
+    return json.loads(plan)[0]["Plan"]
+
+
+def _sequential_scans(plan: Dict[str, Any]) -> List[str]:
+    scans = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            scans.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return scans
+
+
+@pytest.mark.parametrize(("method", "path", "body"), HOT_PATHS)
+def test_hot_path_uses_indexes(client, statements, method, path, body):
+    """Every query behind a hot path can be answered from an index."""
+    for cache in CACHES.values():
+        cache.clear()
+    statements.clear()
+
+    response = client.request(method, path, json=body)
+    assert response.status_code == 200, response.text
+
+    queries = [(sql, params) for sql, params in statements if _reads_table(sql)]
+    assert queries, f"{method} {path} ran no queries"
+    for sql, params in queries:
+        scans = _sequential_scans(asyncio.run(_explain(sql, params)))
+        assert not scans, f"{method} {path} scans {', '.join(scans)}:\n{sql}"
@@ -0,0 +1,136 @@
+"""Read replica routing tests.
+
+Checks which engine serves each request: reads take the replicas in turn,
+writes go to the primary and pin the client's next reads there, and lookups
+that fill a shared cache always read from the primary.
+
+The tests are skipped unless FISHSENSE_TEST_DATABASE_URL points at a
+disposable primary database and FISHSENSE_TEST_REPLICA_URLS lists one or more
+disposable databases to use as replicas; see tests/conftest.py. Two local
+Postgres instances are enough, and pointing two replica URLs at the same
+instance under different host names shows the alternation.
+"""
+
+# pylint: disable=wrong-import-position,redefined-outer-name
+
+import os
+from typing import List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import event
+
+if not os.environ.get("FISHSENSE_TEST_DATABASE_URL"):
+    pytest.skip("FISHSENSE_TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from fishsense_api import app
+from fishsense_api.cache import CACHES
+from fishsense_api.database import DATABASE, READ_PRIMARY_COOKIE, REPLICAS
+from fishsense_api.models.user import User
+
+USER = {
+    "label_studio_id": 1,
+    "email": "diver@example.com",
+    "first_name": "Test",
+    "last_name": "Diver",
+}
+
+
+@pytest.fixture(scope="module")
+def client(primary_url, replica_urls, recreate_database):
+    """Recreate the primary and replicas, then serve the app against them."""
+    recreate_database(primary_url, [User(id=1, **USER)])
+    for url in replica_urls:
+        recreate_database(url)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def checkouts(client):
+    """Record the name of every engine a connection is checked out from."""
+    # pylint: disable=unused-argument
+    checked_out: List[str] = []
+    listeners = [
+        (
+            database.engine.sync_engine,
+            lambda *_, name=database.name: checked_out.append(name),
+        )
+        for database in [DATABASE, *REPLICAS]
+    ]
+    for engine, listener in listeners:
+        event.listen(engine, "checkout", listener)
+    yield checked_out
+    for engine, listener in listeners:
+        event.remove(engine, "checkout", listener)
+
+
+@pytest.fixture
+def request_engines(client, checkouts):
+    """Send a request without cookies and report the engines it used."""
+    client.cookies.clear()
+    for cache in CACHES.values():
+        cache.clear()
+
+    def send(method: str, path: str, **kwargs) -> Tuple[Response, List[str]]:
+        checkouts.clear()
+        response = client.request(method, path, **kwargs)
+        assert response.status_code < 300, response.text
+        return response, list(checkouts)
+
+    return send
+
+
+def test_reads_alternate_across_replicas(request_engines):
+    """Successive reads take each replica in turn and never the primary."""
+    replicas = [replica.name for replica in REPLICAS]
+
+    used = []
+    for _ in range(2 * len(replicas)):
+        _, engines = request_engines("GET", "/api/v1/users/")
+        assert len(engines) == 1 and engines[0] in replicas, engines
+        used.extend(engines)
+
+    assert sorted(used[: len(replicas)]) == sorted(replicas)
+    assert used[len(replicas) :] == used[: len(replicas)]
+
+
+def test_write_sets_read_primary_cookie(request_engines):
+    """A write runs on the primary and pins the client's reads there."""
+    response, engines = request_engines(
+        "PUT",
+        "/api/v1/users/2",
+        json=USER | {"label_studio_id": 2, "email": "writer@example.com"},
+    )
+
+    assert set(engines) == {DATABASE.name}
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+
+def test_reads_with_cookie_go_to_primary(client, request_engines):
+    """Reads from a client that wrote recently are served by the primary."""
+    client.cookies.set(READ_PRIMARY_COOKIE, "1")
+
+    for _ in range(2 * len(REPLICAS)):
+        response, engines = request_engines("GET", "/api/v1/users/")
+        assert engines == [DATABASE.name]
+        assert READ_PRIMARY_COOKIE not in response.cookies
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        f"/api/v1/users/label-studio/{USER['label_studio_id']}",
+        f"/api/v1/users/email/{USER['email']}",
+    ],
+)
+def test_cached_lookups_read_primary(request_engines, path):
+    """Lookups that fill a cache read from the primary without pinning reads."""
+    for _ in range(2 * len(REPLICAS)):
+        for cache in CACHES.values():
+            cache.clear()
+        response, engines = request_engines("GET", path)
+        assert engines == [DATABASE.name]
+        assert READ_PRIMARY_COOKIE not in response.cookies